@@ -0,0 +1,1020 @@
+"""
+Mediciones de rendimiento del proyecto.
+
+Cada benchmark se ejecuta desde la línea de comandos con su nombre, por ejemplo:
+
+    python Benchmark.py scraper
+
+`suite` mide cada función pública de CleanData, SplitDataSet y GraphicsView y el scraper
+sobre un dataset generado; con --json se guardan los resultados y con --compare se comparan
+con una ejecución anterior, terminando con código 1 si alguna medición empeoró:
+
+    python Benchmark.py suite --json base.json
+    python Benchmark.py suite --compare base.json
+
+Los benchmarks del scraper usan un servidor HTTP local que imita los endpoints
+`mes/list/%s` y `mes/latest/month` de la API de la IEA a partir de un CSV, por lo que
+no necesitan conexión a internet.
+"""
+
+# Importamos las bibliotecas necesarias
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import threading
+import functools
+import contextlib
+import collections
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class StubIEAServer:
+    """Servidor local que responde como la API de la IEA con los datos de un CSV."""
+
+    def __init__(self, filepath='DataSet.csv', latency=0.0):
+        with open(filepath, newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        # Índices para responder en tiempo constante por producto y por año completo
+        self.records = {}
+        self.slices = {}
+        for row in rows:
+            key = (row['COUNTRY'], row['YEAR'], row['MONTH'], row['PRODUCT'])
+            self.records[key] = row
+            self.slices.setdefault((row['COUNTRY'], row['YEAR']), []).append(row)
+
+        self.lists = {
+            'YEAR': sorted({row['YEAR'] for row in rows}),
+            'PRODUCT': sorted({row['PRODUCT'] for row in rows}),
+            'COUNTRY': sorted({row['COUNTRY'] for row in rows}),
+        }
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @staticmethod
+    def _record(row):
+        # Mismo formato que un elemento de la lista `latest` de la API
+        return {
+            'COUNTRY': row['COUNTRY'], 'CODE_TIME': '', 'TIME': '', 'YEAR': int(row['YEAR']),
+            'MONTH': int(row['MONTH']), 'MONTH_NAME': '', 'PRODUCT': row['PRODUCT'],
+            'VALUE': float(row['VALUE']), 'DISPLAY_ORDER': 0,
+        }
+
+    def respond(self, path):
+        """Devuelve el cuerpo JSON para una ruta de la API, o None si no hay datos."""
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path.startswith('/mes/list/'):
+            return self.lists.get(url.path.rsplit('/', 1)[1])
+
+        if 'PRODUCT' in query:
+            row = self.records.get((query['COUNTRY'], query['YEAR'], query['MONTH'], query['PRODUCT']))
+            if row is None:
+                return None
+            return {'latest': [self._record(row)], 'yearToDate': float(row['yearToDate'])}
+
+        rows = self.slices.get((query['COUNTRY'], query['YEAR']))
+        if rows is None:
+            return None
+        return {'latest': [self._record(row) for row in rows]}
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.calls += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                body = stub.respond(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_port
+
+
+def bench_scraper_modes(filepath='DataSet.csv', latency=0.02, workers=8):
+    """Compara llamadas HTTP y tiempo total de cada modo de consulta del scraper."""
+    import WebScrapy
+
+    WebScrapy.VERBOSE = False
+    results = []
+    with StubIEAServer(filepath, latency=latency) as stub:
+        for mode in WebScrapy.FETCH_MODES:
+            with tempfile.TemporaryDirectory() as tmp:
+                output = os.path.join(tmp, 'DataSet.csv')
+                stub.calls = 0
+                start = time.perf_counter()
+                rows = WebScrapy.run(output, max_workers=workers, requests_per_second=0,
+                                     api_base=stub.url, mode=mode)
+                results.append({
+                    'modo': mode,
+                    'filas': rows,
+                    'llamadas': stub.calls,
+                    'segundos': round(time.perf_counter() - start, 3),
+                })
+    return results
+
+
+def make_synthetic_dataset(path, scale=100, source='DataSet.csv'):
+    """Genera un CSV con el esquema de DataSet.csv multiplicando `scale` veces sus países.
+
+    Cada copia renombra los países ('Colombia 2', 'Colombia 3', ...) y perturba los valores,
+    de modo que el resultado tiene `scale` veces más filas que el original.
+    """
+    import numpy as np
+    import pandas as pd
+
+    base = pd.read_csv(source)
+    rng = np.random.default_rng(0)
+    copies = []
+    for i in range(scale):
+        copy = base.copy()
+        if i:
+            copy['COUNTRY'] = copy['COUNTRY'] + ' %d' % (i + 1)
+            factor = rng.uniform(0.5, 1.5, len(copy))
+            copy['VALUE'] = copy['VALUE'] * factor
+            copy['yearToDate'] = copy['yearToDate'] * factor
+        copies.append(copy)
+    pd.concat(copies, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+def make_large_dataset(path, size_gb=2.0, source='DataSet.csv'):
+    """Genera un CSV de unos `size_gb` GB repitiendo las filas de DataSet.csv con países renombrados.
+
+    Se escribe copia a copia como texto, sin tener nunca el archivo entero en memoria; los valores
+    se repiten tal cual porque aquí solo importa el volumen.
+    """
+    with open(source) as f:
+        header = f.readline()
+        rows = [line.split(',', 1) for line in f if line.strip()]
+
+    target = size_gb * (1 << 30)
+    copy = 0
+    with open(path, 'w') as f:
+        f.write(header)
+        while f.tell() < target:
+            copy += 1
+            suffix = ' %d,' % copy if copy > 1 else ','
+            f.write(''.join(country + suffix + rest for country, rest in rows))
+    return path
+
+
+def _peak_rss_mb(code):
+    # Ejecuta `code` en un proceso nuevo y devuelve (memoria residente máxima en MB, segundos)
+    script = 'import resource\n%s\nprint(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)' % code
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return round(int(output.split()[-1]) / 1024, 1), round(time.perf_counter() - start, 1)
+
+
+def _timed(func, *args, **kwargs):
+    # Ejecuta una vez y devuelve (resultado, segundos)
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_load_cache(filepath='DataSet.csv', scale=100):
+    """Compara la carga en frío (CSV + limpieza) y en caliente (caché Feather) de load_and_clean_data."""
+    import shutil
+    import CleanData
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets = {
+            'DataSet.csv': shutil.copy(filepath, os.path.join(tmp, 'DataSet.csv')),
+            'sintético x%d' % scale: make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath),
+        }
+        for name, path in datasets.items():
+            _, no_cache = _timed(CleanData.load_and_clean_data, path, use_cache=False)
+            _, cold = _timed(CleanData.load_and_clean_data, path)
+            df, warm = _timed(CleanData.load_and_clean_data, path)
+            results.append({
+                'dataset': name,
+                'filas': len(df),
+                'sin_cache_s': round(no_cache, 4),
+                'frio_s': round(cold, 4),
+                'caliente_s': round(warm, 4),
+                'aceleracion': round(no_cache / warm, 1),
+            })
+    return results
+
+
+def _best_of(func, *args, repeat=5, **kwargs):
+    # Mejor tiempo de varias repeticiones, para reducir el ruido en operaciones rápidas
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Métodos de SplitDataSet que usa el dashboard, con los argumentos con que los llama main.py
+SPLIT_METHODS = [
+    'get_colombia_trade_data',
+    'get_renewable_percentage',
+    'get_non_renewable_percentage',
+    'get_colombia_energy_export_data',
+    'get_distribution_over_net_production_colombia',
+    'get_renewable_and_nonrenewable_data',
+    'get_energy_source_distribution',
+    'get_energy_source_distribution_american',
+]
+
+
+def bench_schema(filepath='DataSet.csv', scale=100):
+    """Compara memoria y tiempo de filtrado de SplitDataSet con el esquema anterior y el compacto."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets = {
+            'DataSet.csv': filepath,
+            'sintético x%d' % scale: make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath),
+        }
+        for name, path in datasets.items():
+            compact, _ = _timed(CleanData.load_and_clean_data, path, use_cache=False)
+
+            # El esquema anterior: texto en PAIS/PRODUCTO y enteros/flotantes de 64 bits
+            legacy = compact.astype({'PAIS': str, 'PRODUCTO': str, 'ANIO': 'int64', 'MES': 'int64'})
+
+            for schema, df in [('anterior', legacy), ('compacto', compact)]:
+                row = {'dataset': name, 'esquema': schema,
+                       'memoria_mb': round(float(df.memory_usage(deep=True).sum()) / 2 ** 20, 2)}
+                for method in SPLIT_METHODS:
+                    row[method] = round(_best_of(getattr(SplitDataSet, method), df) * 1000, 2)
+                results.append(row)
+    return results
+
+
+def _mask_queries(df):
+    # Referencia: las máscaras booleanas sobre todo el DataFrame que usaba SplitDataSet antes del índice
+    anios = df['ANIO'].isin([2020, 2021, 2022, 2023, 2024]) & (df['MES'] == 12)
+    colombia = df['PAIS'] == 'Colombia'
+    fuentes = ['Hidroeléctrica', 'Solar', 'Renovables combustibles', 'Carbón', 'Petróleo', 'Gas natural', 'Otras renovables agregadas']
+    return [
+        df[colombia & anios & df['PRODUCTO'].isin(['Exportaciones totales', 'Importaciones totales', 'Producción neta de electricidad', 'Consumo final'])],
+        df[anios & df['PRODUCTO'].isin(['Renovables'])],
+        df[anios & df['PRODUCTO'].isin(['No renovables'])],
+        df[colombia & anios & df['PRODUCTO'].isin(['Producción neta de electricidad', 'Exportaciones totales'])],
+        df[colombia & (df['MES'] == 12) & df['PRODUCTO'].isin(['Producción neta de electricidad', 'Consumo final', 'Pérdidas de distribución', 'Exportaciones totales'])],
+        df[colombia & anios & df['PRODUCTO'].isin(['Renovables', 'No renovables'])],
+        df[colombia & (df['ANIO'] == 2024) & (df['MES'] == 12) & df['PRODUCTO'].isin(fuentes)],
+        df[anios & df['PRODUCTO'].isin(fuentes)],
+    ]
+
+
+def bench_index(filepath='DataSet.csv', scale=100):
+    """Microbenchmark de los ocho métodos de SplitDataSet: máscaras sobre todo el DataFrame frente al índice."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        df = CleanData.load_and_clean_data(path, use_cache=False)
+
+        index, build = _timed(SplitDataSet.build_index, df)
+        masks = _best_of(_mask_queries, df)
+        lookups = _best_of(lambda: [getattr(SplitDataSet, method)(index) for method in SPLIT_METHODS])
+        results.append({
+            'dataset': 'sintético x%d' % scale,
+            'filas': len(df),
+            'construir_indice_ms': round(build * 1000, 2),
+            'mascaras_8_metodos_ms': round(masks * 1000, 2),
+            'indice_8_metodos_ms': round(lookups * 1000, 2),
+        })
+        for method in SPLIT_METHODS:
+            results.append({'metodo': method, 'indice_ms': round(_best_of(getattr(SplitDataSet, method), index) * 1000, 3)})
+    return results
+
+
+def bench_radar(filepath='DataSet.csv', scale=100):
+    """Tiempo de construir el gráfico radar según el número de países seleccionados."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+    from GraphicsView import GraphicsView
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        index = SplitDataSet.build_index(CleanData.load_and_clean_data(path, use_cache=False))
+        paises = sorted(index.annual['PAIS'].unique())
+
+        for n in [2, 8, 80, len(paises)]:
+            seleccion = paises[:n]
+            results.append({
+                'paises': n,
+                'matriz_ms': round(_best_of(SplitDataSet.get_energy_source_matrix, index, 2024, seleccion) * 1000, 2),
+                'figura_ms': round(_best_of(GraphicsView.plot_radar_energy_comparison, index, seleccion, 2024) * 1000, 2),
+            })
+    return results
+
+
+@contextlib.contextmanager
+def count_calls():
+    """Cuenta las llamadas a load_and_clean_data y a los métodos de SplitDataSet y GraphicsView."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+    from GraphicsView import GraphicsView
+
+    counts = collections.Counter()
+
+    def wrap(name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    originals = [(CleanData, 'load_and_clean_data', CleanData.load_and_clean_data)]
+    for cls in (SplitDataSet, GraphicsView):
+        originals += [(cls, name, value) for name, value in vars(cls).items() if isinstance(value, staticmethod)]
+
+    for owner, name, value in originals:
+        func = value.__func__ if isinstance(value, staticmethod) else value
+        wrapped = wrap('%s.%s' % (getattr(owner, '__name__', owner), name), func)
+        setattr(owner, name, staticmethod(wrapped) if isinstance(value, staticmethod) else wrapped)
+    try:
+        yield counts
+    finally:
+        for owner, name, value in originals:
+            setattr(owner, name, value)
+
+
+def bench_rerun(app='main.py'):
+    """Latencia de cada rerun del dashboard y qué etapas se recalculan en cada uno."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    results = []
+    with count_calls() as counts:
+        at = AppTest.from_file(app, default_timeout=300)
+        pasos = [
+            ('primera carga', lambda: at.run()),
+            ('rerun sin cambios', lambda: at.run()),
+            ('cambiar año del radar', lambda: at.selectbox[0].select(at.selectbox[0].options[-1]).run()),
+            ('quitar un país del radar', lambda: at.multiselect[0].unselect(at.multiselect[0].value[0]).run()),
+        ]
+        for paso, accion in pasos:
+            counts.clear()
+            _, seconds = _timed(accion)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            results.append({'paso': paso, 'segundos': round(seconds, 3), 'recalculado': dict(counts)})
+    return results
+
+
+def _payload_bytes(at):
+    # Bytes de los gráficos (especificación JSON de Plotly) y de los textos que la página envía al navegador
+    charts = sum(len(element.proto.spec) for element in at.get('plotly_chart'))
+    texts = sum(len(element.value) for element in at.markdown)
+    return charts, texts
+
+
+def bench_sections(app='main.py'):
+    """Tiempo hasta el primer gráfico y bytes enviados al abrir el dashboard y cada sección."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    results = []
+    at = AppTest.from_file(app, default_timeout=300)
+    _, seconds = _timed(at.run)
+    charts, texts = _payload_bytes(at)
+    results.append({'paso': 'primera carga', 'segundos': round(seconds, 3), 'graficos': len(at.get('plotly_chart')),
+                    'bytes_graficos': charts, 'bytes_textos': texts})
+
+    # Si la aplicación tiene selector de secciones, se mide también la apertura de cada una
+    for option in (at.radio[0].options if at.radio else [])[1:]:
+        _, seconds = _timed(at.radio[0].set_value(option).run)
+        charts, texts = _payload_bytes(at)
+        results.append({'paso': option, 'segundos': round(seconds, 3), 'graficos': len(at.get('plotly_chart')),
+                        'bytes_graficos': charts, 'bytes_textos': texts})
+    return results
+
+
+# Gráficos de GraphicsView con la extracción de SplitDataSet que los alimenta en el dashboard
+FIGURES = [
+    ('plot_renewable_trend', 'get_renewable_percentage'),
+    ('plot_non_renewable_trend', 'get_non_renewable_percentage'),
+    ('plot_colombia_trade', 'get_colombia_trade_data'),
+    ('plot_colombia_energy_export', 'get_colombia_energy_export_data'),
+    ('plot_energy_source_distribution', 'get_energy_source_distribution'),
+    ('plot_distribution_over_net_production_colombia', 'get_distribution_over_net_production_colombia'),
+    ('plot_renewable_and_nonrenewable_data', 'get_renewable_and_nonrenewable_data'),
+]
+
+
+def bench_figures(filepath='DataSet.csv', scale=100):
+    """Tamaño serializado y tiempo de construcción de cada gráfico, con el dataset actual y uno sintético."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+    from GraphicsView import GraphicsView
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets = {
+            'DataSet.csv': filepath,
+            'sintético x%d' % scale: make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath),
+        }
+        for name, path in datasets.items():
+            index = SplitDataSet.build_index(CleanData.load_and_clean_data(path, use_cache=False))
+            for plot, split in FIGURES:
+                data = getattr(SplitDataSet, split)(index)
+                fig, _ = _timed(getattr(GraphicsView, plot), data)
+                results.append({
+                    'dataset': name,
+                    'grafico': plot,
+                    'puntos': len(data),
+                    'kb': round(len(fig.to_json()) / 1024, 1),
+                    'ms': round(_best_of(getattr(GraphicsView, plot), data, repeat=3) * 1000, 1),
+                })
+    return results
+
+
+def bench_monthly(filepath='DataSet.csv', scale=24):
+    """Tiempo de las series mensuales (acumulado 12 meses, variación interanual y cuota renovable) para ~190 países."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        df = CleanData.load_and_clean_data(path, use_cache=False)
+        series = SplitDataSet.get_monthly_series(df)
+        return [{
+            'dataset': 'sintético x%d' % scale,
+            'paises': df['PAIS'].nunique(),
+            'filas': len(series),
+            'series_mensuales_ms': round(_best_of(SplitDataSet.get_monthly_series, df, repeat=3) * 1000, 1),
+        }]
+
+
+def bench_streaming(filepath='DataSet.csv', size_gb=2.0):
+    """Memoria máxima y tiempo de la carga completa frente a la lectura por bloques sobre un CSV de varios GB."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path, generate = _timed(make_large_dataset, os.path.join(tmp, 'large.csv'), size_gb, filepath)
+        results.append({'csv_gb': round(os.path.getsize(path) / (1 << 30), 2), 'generar_s': round(generate, 1)})
+
+        modes = [
+            ('por bloques (cubo anual)', 'from CleanData import load_annual_data; df = load_annual_data(%r, use_cache=False)'),
+            ('completa (load_and_clean_data)', 'from CleanData import load_and_clean_data; df = load_and_clean_data(%r, use_cache=False)'),
+        ]
+        for name, code in modes:
+            try:
+                rss, seconds = _peak_rss_mb(code % path)
+                results.append({'carga': name, 'memoria_max_mb': rss, 'segundos': seconds})
+            except subprocess.CalledProcessError as error:
+                results.append({'carga': name, 'error': error.stderr.strip().splitlines()[-1:]})
+    return results
+
+
+def bench_backends(filepath='DataSet.csv', scale=100):
+    """Carga y consultas de los métodos de SplitDataSet con el índice en memoria frente a SQLite."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+    from DataStore import SQLiteStore
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        index, load_pandas = _timed(lambda: SplitDataSet.build_index(CleanData.load_and_clean_data(path, use_cache=False)))
+        store = SQLiteStore(os.path.join(tmp, 'synthetic.sqlite'))
+        _, load_sqlite = _timed(store.sync_csv, path)
+        results.append({
+            'dataset': 'sintético x%d' % scale,
+            'carga_pandas_s': round(load_pandas, 2),
+            'carga_sqlite_s': round(load_sqlite, 2),
+            'sqlite_mb': round(os.path.getsize(store.path) / 2**20, 1),
+        })
+        for method in SPLIT_METHODS:
+            results.append({
+                'metodo': method,
+                'pandas_ms': round(_best_of(getattr(SplitDataSet, method), index) * 1000, 2),
+                'sqlite_ms': round(_best_of(getattr(SplitDataSet, method), store) * 1000, 2),
+            })
+    return results
+
+
+def bench_parallel(filepath='DataSet.csv', scale=100, workers=(1, 2, 4, 8)):
+    """Escalado de las tablas por país de CountryEngine con 1, 2, 4 y 8 procesos, comprobando que coinciden con la serie."""
+    import CleanData
+    import CountryEngine
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        df = CleanData.load_and_clean_data(path, use_cache=False)
+
+        serial, base = _timed(CountryEngine.compute_country_tables, df, workers=1)
+        for n in workers:
+            tables, seconds = (serial, base) if n == 1 else _timed(CountryEngine.compute_country_tables, df, workers=n)
+            identical = all(tables[name].equals(serial[name]) for name in CountryEngine.TABLAS)
+            results.append({
+                'procesos': n,
+                'nucleos_disponibles': CountryEngine.default_workers(),
+                'paises': len(serial['matriz']),
+                'segundos': round(seconds, 2),
+                'aceleracion': round(base / seconds, 2),
+                'identico': identical,
+            })
+    return results
+
+
+def bench_distribution(filepath='DataSet.csv', scale=24):
+    """Distribución sobre la producción neta de todos los países: una llamada por país frente a una sola llamada."""
+    import CleanData
+    from SplitDataSet import SplitDataSet
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        index = SplitDataSet.build_index(CleanData.load_and_clean_data(path, use_cache=False))
+        paises = sorted(index.annual['PAIS'].unique())
+
+        def por_pais():
+            return [SplitDataSet.get_distribution_over_net_production_colombia(index, country=pais) for pais in paises]
+
+        return [{
+            'paises': len(paises),
+            'una_llamada_por_pais_ms': round(_best_of(por_pais, repeat=3) * 1000, 1),
+            'todos_los_paises_ms': round(_best_of(SplitDataSet.get_distribution_over_net_production, index, repeat=3) * 1000, 1),
+        }]
+
+
+def bench_profiling(filepath='DataSet.csv', calls=200_000):
+    """Costo de la instrumentación de Profiling: por llamada (desactivada y activada) y sobre los ocho métodos de SplitDataSet."""
+    import CleanData
+    import Profiling
+    from SplitDataSet import SplitDataSet
+
+    def noop(df):
+        return df
+
+    wrapped = Profiling.timed('benchmark.noop')(noop)
+    index = SplitDataSet.build_index(CleanData.load_and_clean_data(filepath))
+    enabled = Profiling.is_enabled()
+
+    def per_call(func):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func(None)
+        return (time.perf_counter() - start) / calls * 1e9
+
+    def methods():
+        for method in SPLIT_METHODS:
+            getattr(SplitDataSet, method)(index)
+
+    results = []
+    try:
+        for state in (False, True):
+            Profiling.enable(state)
+            results.append({
+                'perfilado': 'activado' if state else 'desactivado',
+                'llamada_directa_ns': round(per_call(noop), 1),
+                'llamada_instrumentada_ns': round(per_call(wrapped), 1),
+                'metodos_split_ms': round(_best_of(methods) * 1000, 3),
+            })
+    finally:
+        Profiling.enable(enabled)
+        Profiling.reset()
+    return results
+
+
+def _appended_dataset(tmp, path):
+    """Prepara en `tmp` un CSV con la caché de su versión anterior: las filas del último país y año van al final.
+
+    Devuelve (CSV, copia de la caché anterior); copiar la caché sobre la del CSV deja listo otro update_cache.
+    """
+    import shutil
+    import pandas as pd
+    import CleanData
+
+    raw = pd.read_csv(path)
+    ultimo = (raw['COUNTRY'] == raw['COUNTRY'].iloc[-1]) & (raw['YEAR'] == raw['YEAR'].max())
+    output = os.path.join(tmp, 'appended.csv')
+    raw[~ultimo].to_csv(output, index=False)
+    CleanData.load_and_clean_data(output)
+    saved = shutil.copyfile(CleanData.cache_path(output), os.path.join(tmp, 'appended.previous.feather'))
+    with open(output, 'a') as f:
+        f.write(raw[ultimo].to_csv(index=False, header=False))
+    return output, saved
+
+
+def bench_delta(countries=400, years=5):
+    """Recarga tras añadir al CSV las filas de un país y año: todo desde cero frente a solo las particiones tocadas."""
+    import shutil
+    import CleanData
+    from SplitDataSet import SplitDataSet
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path, saved = _appended_dataset(tmp, make_scaled_dataset(os.path.join(tmp, 'scaled.csv'), countries, years))
+        index = SplitDataSet.build_index(CleanData.load_and_clean_data(path, use_cache=False))
+        metrics = SplitDataSet.get_headline_metrics(index)
+        ultimo = set(metrics.iloc[[-1]][['PAIS', 'ANIO']].itertuples(index=False, name=None))
+
+        def delta():
+            shutil.copyfile(saved, CleanData.cache_path(path))
+            return CleanData.load_and_clean_data(path)
+
+        for name, func in (
+            ('load_and_clean_data[completo]', lambda: CleanData.load_and_clean_data(path, use_cache=False)),
+            ('load_and_clean_data[delta]', delta),
+            ('get_headline_metrics[completo]', lambda: SplitDataSet.get_headline_metrics(index)),
+            ('get_headline_metrics[delta]', lambda: SplitDataSet.get_headline_metrics(index, metrics, ultimo)),
+        ):
+            results.append({'nombre': name, 'dataset': '%dx%d' % (countries, years), 'ms': round(_best_of(func, repeat=3) * 1000, 1)})
+
+        # Filas repetidas al final del CSV: con 'dedupe' la actualización debe coincidir con reconstruir desde cero
+        with open(path) as f:
+            repetidas = f.readlines()[-5:]
+        for name, load in (('load_and_clean_data', CleanData.load_and_clean_data), ('load_annual_data', CleanData.load_annual_data)):
+            dup = shutil.copyfile(path, os.path.join(tmp, 'duplicated_%s.csv' % name))
+            load(dup, validation='dedupe')
+            with open(dup, 'a') as f:
+                f.writelines(repetidas)
+            delta, seconds = _timed(load, dup, validation='dedupe')
+            results.append({'nombre': '%s[delta, dedupe]' % name, 'dataset': '%dx%d' % (countries, years), 'ms': round(seconds * 1000, 1),
+                            'identico': delta.equals(load(dup, use_cache=False, validation='dedupe'))})
+    return results
+
+
+def bench_validation(filepath='DataSet.csv', scale=100):
+    """Etapa de validación sobre el dataset ampliado: las reglas solas y la carga sin validar, informando y descartando."""
+    import pandas as pd
+    import CleanData
+    import Validation
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_synthetic_dataset(os.path.join(tmp, 'synthetic.csv'), scale, filepath)
+        columns = CleanData.clean_columns(pd.read_csv(path))
+        informe, _ = Validation.validate(columns)
+        dataset = 'sintético x%d' % scale
+
+        for name, func in (
+            ('Validation.validate', lambda: Validation.validate(columns)),
+            ('load_and_clean_data[off]', lambda: CleanData.load_and_clean_data(path, use_cache=False, validation='off')),
+            ('load_and_clean_data[report]', lambda: CleanData.load_and_clean_data(path, use_cache=False)),
+            ('load_and_clean_data[quarantine]', lambda: CleanData.load_and_clean_data(path, use_cache=False, validation='quarantine')),
+        ):
+            results.append({'nombre': name, 'dataset': dataset, 'filas': len(columns), 'ms': round(_best_of(func, repeat=3) * 1000, 1)})
+        results[0]['resumen'] = Validation.summary(informe)
+    return results
+
+
+def _import_times(code):
+    # Ejecuta `code` en un proceso nuevo con -X importtime y devuelve ({módulo importado: ms acumulados}, segundos)
+    start = time.perf_counter()
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+    elapsed = time.perf_counter() - start
+
+    # Cada línea es "import time: propio | acumulado | módulo"; la sangría del nombre indica el anidamiento,
+    # así que sumar los módulos sin sangría da el tiempo total de importación
+    modules = {}
+    for line in stderr.splitlines():
+        fields = line.split('|')
+        if line.startswith('import time:') and len(fields) == 3 and fields[1].strip().isdigit():
+            name = fields[2][1:]
+            if not name.startswith(' '):
+                modules[name] = modules.get(name, 0) + int(fields[1]) / 1000
+    return modules, elapsed
+
+
+def _startup_record(name, code, **extra):
+    modules, elapsed = _import_times(code)
+    slowest = sorted(modules.items(), key=lambda item: -item[1])[:5]
+    return dict({
+        'nombre': name,
+        'ms': round(elapsed * 1000, 1),
+        'importaciones_ms': round(sum(modules.values()), 1),
+        'mas_lentas': {module: round(ms, 1) for module, ms in slowest},
+    }, **extra)
+
+
+def bench_startup(filepath='DataSet.csv', app='main.py'):
+    """Arranque en frío, en un proceso nuevo y medido con `python -X importtime`.
+
+    Mide la primera ejecución del dashboard, la importación de cada módulo del proyecto y una
+    ejecución del scraper sin datos nuevos contra el servidor local, con las listas de la API
+    pedidas de nuevo y reutilizadas desde disco.
+    """
+    import shutil
+    import WebScrapy
+
+    results = [_startup_record('dashboard', 'from streamlit.testing.v1 import AppTest\n'
+                                            'AppTest.from_file(%r, default_timeout=300).run()' % app)]
+    for module in ('CleanData', 'SplitDataSet', 'GraphicsView', 'WebScrapy', 'DataStore', 'Refresh', 'CountryEngine'):
+        results.append(_startup_record('import %s' % module, 'import %s' % module))
+
+    with tempfile.TemporaryDirectory() as tmp, StubIEAServer(filepath) as stub:
+        output = shutil.copy(filepath, os.path.join(tmp, 'DataSet.csv'))
+        run = 'import WebScrapy\nWebScrapy.run(%r, requests_per_second=0, api_base=%r, verbose=False, lists_ttl=%%r)' % (output, stub.url)
+
+        # La primera ejecución guarda en el manifiesto lo que la API no tiene; las medidas son ya sin datos nuevos
+        WebScrapy.run(output, requests_per_second=0, api_base=stub.url, verbose=False)
+        for label, ttl in (('listas de la API', 0), ('listas en disco', WebScrapy.LISTS_TTL)):
+            stub.calls = 0
+            record = _startup_record('scraper sin cambios (%s)' % label, run % ttl)
+            record['llamadas_http'] = stub.calls
+            results.append(record)
+    return results
+
+
+def make_scaled_dataset(path, countries=8, years=5, products=None, source='DataSet.csv', last_year=2024):
+    """Genera un CSV con el esquema de DataSet.csv de `countries` países × `years` años × `products` productos.
+
+    Los países y productos reales se usan primero ('Colombia 2', 'Producto sintético 1', ... cuando
+    no alcanzan); cada país y producto tiene un nivel propio con estacionalidad y ruido, y yearToDate
+    es el acumulado de VALUE dentro de cada año, como en la API.
+    """
+    import numpy as np
+    import pandas as pd
+
+    base = pd.read_csv(source, usecols=['COUNTRY', 'PRODUCT'])
+    base_countries = list(dict.fromkeys(base['COUNTRY']))
+    base_products = list(dict.fromkeys(base['PRODUCT']))
+    products = len(base_products) if products is None else products
+
+    country_names = [name if i < len(base_countries) else '%s %d' % (name, i // len(base_countries) + 1)
+                     for i, name in enumerate(base_countries * (countries // len(base_countries) + 1))][:countries]
+    product_names = (base_products + ['Producto sintético %d' % (i + 1) for i in range(max(0, products - len(base_products)))])[:products]
+    year_values = np.arange(last_year - years + 1, last_year + 1)
+
+    # Malla completa país × año × mes × producto, en el orden en que escribe el scraper
+    c, y, m, p = np.meshgrid(np.arange(countries), year_values, np.arange(1, 13), np.arange(products), indexing='ij')
+    rng = np.random.default_rng(0)
+    level = rng.lognormal(6, 1.5, (countries, products))
+    value = level[c, p] * (1 + 0.2 * np.sin(m / 12 * 2 * np.pi)) * rng.uniform(0.8, 1.2, c.shape)
+    year_to_date = np.cumsum(value, axis=2)
+
+    pd.DataFrame({
+        'COUNTRY': np.array(country_names, dtype=object)[c.ravel()],
+        'YEAR': y.ravel(),
+        'MONTH': m.ravel(),
+        'PRODUCT': np.array(product_names, dtype=object)[p.ravel()],
+        'VALUE': value.ravel().round(6),
+        'yearToDate': year_to_date.ravel().round(6),
+    }).to_csv(path, index=False)
+    return path
+
+
+def _public_functions():
+    # Funciones públicas de CleanData y métodos públicos de SplitDataSet y GraphicsView que la suite debe cubrir
+    import inspect
+    import CleanData
+    from SplitDataSet import SplitDataSet
+    from GraphicsView import GraphicsView
+
+    names = ['CleanData.%s' % name for name, func in inspect.getmembers(CleanData, inspect.isfunction)
+             if func.__module__ == 'CleanData' and not name.startswith('_')]
+    for cls in (SplitDataSet, GraphicsView):
+        names += ['%s.%s' % (cls.__name__, name) for name, value in vars(cls).items()
+                  if isinstance(value, staticmethod) and not name.startswith('_')]
+    return names
+
+
+def _suite_cases(tmp, path):
+    # (nombre, función sin argumentos) de cada caso; los datos se preparan una vez fuera del tiempo medido
+    import shutil
+    import pandas as pd
+    import CleanData
+    from SplitDataSet import SplitDataSet, FUENTES_ENERGIA
+    from GraphicsView import GraphicsView
+
+    raw = pd.read_csv(path)
+    df = CleanData.load_and_clean_data(path, use_cache=False)
+    columns = CleanData.clean_columns(raw)
+    cube = CleanData.reduce_to_annual(df)
+    index = SplitDataSet.build_index(df)
+    paises = sorted(index.annual['PAIS'].unique())
+    cache_copy = os.path.join(tmp, 'cache.csv')
+    shutil.copyfile(path, cache_copy)
+    CleanData.load_and_clean_data(cache_copy)
+    delta_path, delta_cache = _appended_dataset(tmp, path)
+    _, informe = CleanData.validate_data(path, columns)
+
+    cases = [
+        ('CleanData.cache_path', lambda: CleanData.cache_path(path)),
+        ('CleanData.annual_cache_path', lambda: CleanData.annual_cache_path(path)),
+        ('CleanData.metrics_cache_path', lambda: CleanData.metrics_cache_path(path)),
+        ('CleanData.quarantine_path', lambda: CleanData.quarantine_path(path)),
+        ('CleanData.file_hash', lambda: CleanData.file_hash(path)),
+        ('CleanData.source_key', lambda: CleanData.source_key(path)),
+        ('CleanData.read_cache', lambda: CleanData.read_cache(cache_copy)),
+        ('CleanData.write_cache', lambda: CleanData.write_cache(cache_copy, df)),
+        ('CleanData.partition_hashes', lambda: CleanData.partition_hashes(df)),
+        ('CleanData.update_cache', lambda: (shutil.copyfile(delta_cache, CleanData.cache_path(delta_path)), CleanData.update_cache(delta_path))),
+        ('CleanData.load_headline_metrics', lambda: CleanData.load_headline_metrics(cache_copy, lambda: index)),
+        ('CleanData.log_diagnostics', lambda: CleanData.log_diagnostics(df, 'full')),
+        ('CleanData.validate_data', lambda: CleanData.validate_data(path, columns)),
+        ('CleanData.validate_data[quarantine]', lambda: CleanData.validate_data(cache_copy, columns, 'quarantine')),
+        ('CleanData.write_quarantine', lambda: CleanData.write_quarantine(cache_copy, columns.head(1000))),
+        ('CleanData.log_validation', lambda: CleanData.log_validation(path, informe)),
+        ('CleanData.load_and_clean_data', lambda: CleanData.load_and_clean_data(path, use_cache=False)),
+        ('CleanData.load_and_clean_data[caché]', lambda: CleanData.load_and_clean_data(cache_copy)),
+        ('CleanData.load_annual_data', lambda: CleanData.load_annual_data(path, use_cache=False)),
+        ('CleanData.reduce_to_annual', lambda: CleanData.reduce_to_annual(df)),
+        ('CleanData.compact_annual', lambda: CleanData.compact_annual([cube, cube])),
+        ('CleanData.whole_periods', lambda: list(CleanData.whole_periods([columns.iloc[:len(columns) // 2], columns.iloc[len(columns) // 2:]]))),
+        ('CleanData.translate_categories', lambda: CleanData.translate_categories(raw['PRODUCT'].astype('category'), CleanData.traducciones_productos)),
+        ('CleanData.clean_data', lambda: CleanData.clean_data(raw)),
+        ('CleanData.clean_columns', lambda: CleanData.clean_columns(raw)),
+        ('CleanData.add_net_production_share', lambda: CleanData.add_net_production_share(columns.copy())),
+        ('SplitDataSet.build_index', lambda: SplitDataSet.build_index(df)),
+        ('SplitDataSet.get_annual_cube', lambda: SplitDataSet.get_annual_cube(df)),
+        ('SplitDataSet.select', lambda: SplitDataSet.select(index, FUENTES_ENERGIA)),
+        ('SplitDataSet.select[mes]', lambda: SplitDataSet.select(index, FUENTES_ENERGIA, month=6)),
+        ('SplitDataSet.get_energy_source_matrix', lambda: SplitDataSet.get_energy_source_matrix(index)),
+        ('SplitDataSet.get_monthly_series', lambda: SplitDataSet.get_monthly_series(df)),
+        ('SplitDataSet.get_distribution_over_net_production', lambda: SplitDataSet.get_distribution_over_net_production(index)),
+        ('SplitDataSet.get_headline_metrics', lambda: SplitDataSet.get_headline_metrics(index)),
+        ('GraphicsView.plot_radar_energy_comparison', lambda: GraphicsView.plot_radar_energy_comparison(index, paises[:8], 2024)),
+    ]
+    cases += [('SplitDataSet.%s' % method, functools.partial(getattr(SplitDataSet, method), index)) for method in SPLIT_METHODS]
+    cases += [('GraphicsView.%s' % plot, functools.partial(getattr(GraphicsView, plot), getattr(SplitDataSet, split)(index)))
+              for plot, split in FIGURES]
+    return cases
+
+
+def _scraper_cases(tmp, path):
+    # Ejecuciones completas del scraper contra el servidor local; cada una escribe un CSV nuevo
+    import WebScrapy
+
+    def scrape(mode, paises):
+        output = os.path.join(tmp, 'scrape_%s.csv' % mode)
+        for leftover in (output, WebScrapy.checkpoint_path(output), WebScrapy.lists_cache_path(output)):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        with StubIEAServer(path) as stub:
+            WebScrapy.run(output, requests_per_second=0, api_base=stub.url, paises=paises, mode=mode)
+
+    return [
+        ('WebScrapy.run[product]', lambda: scrape('product', ['Colombia'])),
+        ('WebScrapy.run[year]', lambda: scrape('year', WebScrapy.paises_america)),
+    ]
+
+
+def bench_suite(countries=40, years=5, products=None, repeat=5):
+    """Suite completa: cada función pública de CleanData, SplitDataSet y GraphicsView y el scraper sin conexión.
+
+    Los datos se generan con make_scaled_dataset; cada resultado lleva el nombre de la función y el
+    tamaño del dataset para poder compararlo con ejecuciones anteriores (--json y --compare).
+    """
+    import WebScrapy
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_dataset(os.path.join(tmp, 'scaled.csv'), countries, years, products)
+        with open(path) as f:
+            rows = sum(1 for _ in f) - 1
+        dataset = '%dx%dx%s' % (countries, years, products or 'todos')
+
+        cases = _suite_cases(tmp, path)
+        for name, func in cases:
+            func()  # Calentamiento: importaciones perezosas y cachés internas fuera de la medición
+            results.append({'nombre': name, 'dataset': dataset, 'filas': rows, 'ms': round(_best_of(func, repeat=repeat) * 1000, 3)})
+
+        verbose, WebScrapy.VERBOSE = WebScrapy.VERBOSE, False
+        try:
+            for name, func in _scraper_cases(tmp, path):
+                results.append({'nombre': name, 'dataset': dataset, 'filas': rows, 'ms': round(_best_of(func, repeat=3) * 1000, 1)})
+        finally:
+            WebScrapy.VERBOSE = verbose
+
+    # Cualquier función pública nueva sin caso en la suite queda señalada en los resultados
+    covered = {name.split('[')[0] for name, _ in cases}
+    results += [{'nombre': name, 'sin_benchmark': True} for name in _public_functions() if name not in covered]
+    return results
+
+
+def compare_results(current, baseline, threshold=0.25, min_ms=1.0):
+    """Compara dos ejecuciones guardadas con --json y devuelve las mediciones que empeoraron más que `threshold`.
+
+    Se comparan los resultados con 'nombre' y 'ms' del mismo benchmark, nombre y dataset; los
+    cambios de menos de `min_ms` milisegundos se ignoran porque son ruido en funciones muy rápidas.
+    Si la medición anterior era 0 ms solo cuenta `min_ms` y el cambio relativo se informa como None.
+    """
+    def timings(run):
+        return {(bench, record['nombre'], record.get('dataset')): record['ms']
+                for bench, records in run['resultados'].items() for record in records
+                if 'nombre' in record and 'ms' in record}
+
+    before = timings(baseline)
+    regressions = []
+    for key, ms in timings(current).items():
+        if key in before and ms > before[key] * (1 + threshold) and ms - before[key] >= min_ms:
+            bench, name, dataset = key
+            change = round(ms / before[key] - 1, 3) if before[key] > 0 else None
+            regressions.append({'benchmark': bench, 'nombre': name, 'dataset': dataset,
+                                'antes_ms': before[key], 'ahora_ms': ms, 'cambio': change})
+    return regressions
+
+
+# Benchmarks disponibles desde la línea de comandos
+BENCHMARKS = {
+    'scraper': bench_scraper_modes,
+    'cache': bench_load_cache,
+    'schema': bench_schema,
+    'index': bench_index,
+    'radar': bench_radar,
+    'rerun': bench_rerun,
+    'sections': bench_sections,
+    'figures': bench_figures,
+    'monthly': bench_monthly,
+    'streaming': bench_streaming,
+    'backends': bench_backends,
+    'parallel': bench_parallel,
+    'distribution': bench_distribution,
+    'suite': bench_suite,
+    'profiling': bench_profiling,
+    'startup': bench_startup,
+    'delta': bench_delta,
+    'validation': bench_validation,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mediciones de rendimiento del proyecto.')
+    parser.add_argument('benchmarks', nargs='*', help='Benchmarks a ejecutar: %s (por defecto, todos)' % ', '.join(BENCHMARKS))
+    parser.add_argument('--json', metavar='PATH', help='Guarda los resultados en un archivo JSON')
+    parser.add_argument('--compare', metavar='PATH', help='Compara con un JSON anterior y señala las regresiones')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Empeoramiento relativo que cuenta como regresión (por defecto 0.25)')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error('benchmark desconocido: %s' % ', '.join(unknown))
+
+    run = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'resultados': {},
+    }
+    for name in args.benchmarks or BENCHMARKS:
+        print('\n⏱️ %s' % name)
+        print('-' * 40)
+        run['resultados'][name] = BENCHMARKS[name]()
+        for result in run['resultados'][name]:
+            print(result)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(run, f, indent=2, ensure_ascii=False, default=str)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(run, json.load(f), args.threshold)
+        print('\n📉 Regresiones (> %d%%): %d' % (args.threshold * 100, len(regressions)))
+        for regression in regressions:
+            print(regression)
+        sys.exit(1 if regressions else 0)
@@ -1,113 +1,616 @@
 # Se importa la librería que se va a usar en la limpieza  
+import io
+import os
+import json
+import time
+import hashlib
+import logging
 import pandas as pd
 
-def load_and_clean_data(filepath):
-    print("📥 Leyendo el archivo:", filepath)
-    df = pd.read_csv(filepath, sep=',')
+import Validation
+from Profiling import timed
 
-    # Validar años únicos
-    print("\n📆 AÑOS DISPONIBLES")
-    print("-" * 40)
-    print(df['YEAR'].unique())
+# pyarrow es opcional: sin él se limpia siempre desde el CSV
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
 
-    # Validar valores nulos
-    print("\n🧼 VALORES NULOS POR COLUMNA")
-    print("-" * 40)
-    print(df.isnull().sum())
+logger = logging.getLogger(__name__)
 
+# Niveles de diagnóstico: sin cálculos extra, resumen (únicos y nulos) o completo (info y describe)
+DIAGNOSTICS_LEVELS = ('off', 'summary', 'full')
+
+# Versión del formato de la caché; se incrementa cuando cambia la limpieza para invalidar cachés antiguas
+CACHE_VERSION = 3
+
+# Filas por bloque al leer el CSV por partes, y tamaño a partir del cual el dashboard carga solo el cubo anual
+CHUNKSIZE = 500_000
+STREAMING_MIN_BYTES = 1 << 30
+
+# Traducciones de PRODUCTOS
+traducciones_productos = {
+    'Hydro': 'Hidroeléctrica',
+    'Wind': 'Eólica',
+    'Solar': 'Solar',
+    'Geothermal': 'Geotérmica',
+    'Other renewables': 'Otras renovables',
+    'Nuclear': 'Nuclear',
+    'Total combustible fuels': 'Total combustibles',
+    'Coal': 'Carbón',
+    'Oil': 'Petróleo',
+    'Natural gas': 'Gas natural',
+    'Combustible renewables': 'Renovables combustibles',
+    'Other combustible non-renewables': 'Otros no renovables combustibles',
+    'Not specified': 'No especificado',
+    'Net electricity production': 'Producción neta de electricidad',
+    'Total imports': 'Importaciones totales',
+    'Total exports': 'Exportaciones totales',
+    'Electricity supplied': 'Electricidad suministrada',
+    'Used for pumped storage': 'Usado para almacenamiento por bombeo',
+    'Distribution losses': 'Pérdidas de distribución',
+    'Final consumption': 'Consumo final',
+    'Electricity trade': 'Intercambio de electricidad',
+    'Renewables': 'Renovables',
+    'Non-renewables': 'No renovables',
+    'Others': 'Otros',
+    'Other renewables aggregated': 'Otras renovables agregadas',
+    'Low carbon': 'Bajo carbono',
+    'Fossil fuels': 'Combustibles fósiles'
+}
+
+# Traducciones de PAÍSES
+traducciones_paises = {
+    'Argentina': 'Argentina',
+    'Brazil': 'Brasil',
+    'Canada': 'Canadá',
+    'Chile': 'Chile',
+    'Colombia': 'Colombia',
+    'Mexico': 'México',
+    'United States': 'Estados Unidos',
+    'Costa Rica': 'Costa Rica'
+}
+
+# Esquema declarado del DataFrame limpio (las columnas de valores usan el tipo flotante configurado)
+ESQUEMA = {
+    'PAIS': 'category',
+    'ANIO': 'int16',
+    'MES': 'int8',
+    'PRODUCTO': 'category',
+}
+COLUMNAS_VALORES = ['ELECTRICIDAD_GENERADA_GWH', 'ELECTRICIDAD_GENERADA_ACUMULADA', 'PORCENTAJE_SOBRE_PRODUCCION_NETA']
+
+# Columnas del CSV del scraper y su nombre en el DataFrame limpio
+COLUMNAS_CSV = {
+    "COUNTRY": "PAIS",
+    "YEAR": "ANIO",
+    "MONTH": "MES",
+    "PRODUCT": "PRODUCTO",
+    "VALUE": "ELECTRICIDAD_GENERADA_GWH",
+    "yearToDate": "ELECTRICIDAD_GENERADA_ACUMULADA"
+}
+
+
+def cache_path(filepath):
+    """Ruta del archivo Feather con el DataFrame ya limpio de un CSV."""
+    return filepath + '.cache.feather'
+
+
+def file_hash(filepath):
+    """Hash SHA-256 del contenido de un archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(filepath):
+    """Identifica la versión de un archivo por su fecha de modificación y su tamaño."""
+    stat = os.stat(filepath)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def annual_cache_path(filepath):
+    """Ruta del cubo anual calculado por partes, junto al CSV."""
+    return filepath + '.annual.feather'
+
+
+def metrics_cache_path(filepath):
+    """Ruta de las métricas de resultados precalculadas, junto al CSV."""
+    return filepath + '.metrics.feather'
+
+
+def _read_metadata(path):
+    # Clave guardada en una caché Feather (CSV, versión, tipo flotante y particiones), o None si no se puede leer
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        metadata = pa.ipc.open_file(path).schema.metadata or {}
+        return json.loads(metadata.get(b'energia_cache', b'{}'))
+    except (pa.ArrowInvalid, OSError, ValueError):
+        return None
+
+
+def quarantine_path(filepath):
+    """Ruta del CSV con las filas apartadas por la validación (acción 'quarantine')."""
+    return filepath + '.quarantine.csv'
+
+
+def _discard(validation):
+    # Acción de validación que quita filas y por tanto cambia el DataFrame guardado ('dedupe' o 'quarantine')
+    return validation if validation in ('dedupe', 'quarantine') else None
+
+
+def _same_options(cached, float_dtype, validation):
+    # Indica si una caché se calculó con la versión, el tipo flotante y el descarte de filas pedidos
+    return (cached.get('version') == CACHE_VERSION and cached.get('float_dtype') == float_dtype
+            and cached.get('descarte') == _discard(validation))
+
+
+def _matches(filepath, cached, float_dtype, validation='report'):
+    # Indica si la clave de una caché sigue correspondiendo al CSV
+    if not cached or not _same_options(cached, float_dtype, validation):
+        return False
+
+    key = source_key(filepath)
+    if (cached.get('mtime_ns'), cached.get('size')) != (key['mtime_ns'], key['size']):
+        if cached.get('size') != key['size'] or cached.get('sha256') != file_hash(filepath):
+            return False
+    return True
+
+
+@timed('CleanData.read_cache')
+def read_cache(filepath, float_dtype='float64', path=None, validation='report'):
+    """Devuelve el DataFrame limpio desde la caché si sigue correspondiendo al CSV, o None.
+
+    Primero se compara fecha de modificación y tamaño; si no coinciden se compara el
+    hash del contenido, para no invalidar la caché cuando el archivo solo fue tocado. En ese
+    caso se guarda en la clave la nueva fecha, así las lecturas siguientes no vuelven a calcular el hash.
+    """
+    path = path or cache_path(filepath)
+    key = source_key(filepath)
+    cached = _read_metadata(path)
+    if not _matches(filepath, cached, float_dtype, validation):
+        return None
+
+    # Lectura mapeada en memoria: el sistema operativo carga solo las páginas que se usan
+    table = feather.read_table(path, memory_map=True)
+    if cached.get('mtime_ns') != key['mtime_ns'] and source_key(filepath) == key:
+        # Mismo contenido con otra fecha (touch, copia, checkout): se reescribe la caché con la fecha actual;
+        # la tabla mapeada sigue siendo válida porque os.replace no modifica el archivo anterior
+        _write_table(table, dict(cached, **key), path)
+    return table.to_pandas()
+
+
+def write_cache(filepath, df, sha256=None, float_dtype='float64', path=None, partitions=None, validation='report'):
+    """Guarda el DataFrame limpio en formato Feather sin comprimir, junto con la clave del CSV.
+
+    `partitions` son los hashes de contenido por (país, año) de los datos de los que sale el
+    DataFrame (ver `partition_hashes`); permiten actualizar después solo lo que cambió. Si la
+    validación descartó filas (`validation` 'dedupe' o 'quarantine'), la acción forma parte de la clave.
+    """
+    if pa is None:
+        return
+
+    key = dict(source_key(filepath), version=CACHE_VERSION, float_dtype=float_dtype,
+               sha256=sha256 or file_hash(filepath))
+    if _discard(validation):
+        key['descarte'] = _discard(validation)
+    if partitions is not None:
+        key['particiones'] = [[pais, anio, digest] for (pais, anio), digest in sorted(partitions.items())]
+    _write_table(pa.Table.from_pandas(df), key, path or cache_path(filepath))
+
+
+def _write_table(table, key, path):
+    # Guarda una tabla Arrow con la clave de caché en sus metadatos (reemplazando la que tuviera al leerla de otra caché)
+    metadata = {name: value for name, value in (table.schema.metadata or {}).items() if name != b'energia_cache'}
+    table = table.replace_schema_metadata(dict(metadata, energia_cache=json.dumps(key)))
+
+    # Se escribe en un archivo temporal y se reemplaza para no dejar nunca una caché a medias
+    tmp_path = path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def partition_hashes(df):
+    """Hash del contenido de cada partición (país, año) de un DataFrame limpio: {(PAIS, ANIO): hash}.
+
+    El hash de una partición es la suma de los hashes de sus filas, así que no depende del orden
+    de las filas y cambia si cualquiera de ellas cambia, aparece o desaparece.
+    """
+    if df.empty:
+        return {}
+    filas = pd.util.hash_pandas_object(df, index=False)
+    sumas = filas.groupby([df['PAIS'], df['ANIO']], observed=True).sum()
+    return {(str(pais), int(anio)): '%016x' % digest for (pais, anio), digest in sumas.items()}
+
+
+def _stored_partitions(cached):
+    # Hashes de particiones guardados en la clave de una caché, o None si la caché no los tiene
+    if not cached or 'particiones' not in cached:
+        return None
+    return {(pais, anio): digest for pais, anio, digest in cached['particiones']}
+
+
+def _concat_clean(frames, ignore_index=True):
+    # Une DataFrames limpios con las mismas categorías que daría limpiar todas sus filas juntas:
+    # las etiquetas originales (en inglés) ordenadas y luego traducidas, como en clean_columns
+    for column, traducciones in (('PAIS', traducciones_paises), ('PRODUCTO', traducciones_productos)):
+        originales = {traducido: original for original, traducido in traducciones.items()}
+        etiquetas = set().union(*(frame[column].cat.categories for frame in frames))
+        categorias = sorted(etiquetas, key=lambda etiqueta: originales.get(etiqueta, etiqueta))
+        frames = [frame if list(frame[column].cat.categories) == categorias
+                  else frame.astype({column: pd.CategoricalDtype(categorias)}) for frame in frames]
+    return pd.concat(frames, ignore_index=ignore_index)
+
+
+@timed('CleanData.update_cache')
+def update_cache(filepath, float_dtype='float64', annual=False, validation='report'):
+    """Actualiza la caché de un CSV al que solo se le añadieron filas al final y devuelve el DataFrame, o None.
+
+    Si el principio del CSV sigue siendo el archivo que se guardó en caché, solo se leen y limpian
+    las filas nuevas. En la caché completa el porcentaje sobre la producción neta se recalcula solo
+    en las particiones (país, año) que tocan esas filas; en el cubo anual (`annual`) las filas
+    nuevas se combinan con el cubo, que ya es pequeño. Devuelve None si el CSV cambió de otra forma.
+
+    La validación se aplica a las filas nuevas junto con las filas en caché de las particiones que
+    tocan (en el cubo anual, las del último mes, así que una copia de un mes anterior no llega a la
+    cuarentena, aunque tampoco al cubo) y las filas en cuarentena se añaden al final del archivo de cuarentena.
+    """
+    path = annual_cache_path(filepath) if annual else cache_path(filepath)
+    cached = _read_metadata(path)
+    previas = _stored_partitions(cached)
+    if previas is None or not _same_options(cached, float_dtype, validation):
+        return None
+
+    size, total = cached.get('size', 0), source_key(filepath)['size']
+    if not 0 < size < total:
+        return None
+
+    # El prefijo del CSV debe ser exactamente el archivo en caché, terminado en una línea completa
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        f.seek(0)
+        for block in iter(lambda: f.read(min(1 << 20, size - f.tell())), b''):
+            digest.update(block)
+            last = block
+        if digest.hexdigest() != cached.get('sha256') or not last.endswith(b'\n'):
+            return None
+        tail = f.read(total - size)
+    if not tail.endswith(b'\n'):
+        return None
+    digest.update(tail)
+
+    nuevas = clean_columns(pd.read_csv(io.BytesIO(header + tail), sep=','), float_dtype)
+    cacheado = feather.read_table(path, memory_map=True).to_pandas()
+    share = 'PORCENTAJE_SOBRE_PRODUCCION_NETA'
+
+    # Las filas nuevas se validan junto con las filas en caché de las particiones (país, año) que tocan,
+    # así una clave repetida que ya estaba en la caché se detecta igual que al limpiar todo el CSV
+    df = _concat_clean([cacheado, nuevas])
+    claves = df['PAIS'].cat.codes.astype('int64') * 10_000 + df['ANIO']
+    tocadas = claves.isin(claves.iloc[len(cacheado):].unique())
+    parte, informe = validate_data(filepath, df.loc[tocadas].drop(columns=share), validation, append=True)
+    # Las filas descartadas salen por su etiqueta, así el resto conserva el orden de una limpieza completa
+    df = df.drop(df.index[tocadas].difference(parte.index))
+
+    if annual:
+        df = add_net_production_share(reduce_to_annual(df.drop(columns=share)).reset_index(drop=True), float_dtype)
+        particiones = partition_hashes(df)
+    else:
+        parte = add_net_production_share(parte, float_dtype)
+        df.loc[parte.index, share] = parte[share]
+        df = df.reset_index(drop=True)
+        # Las particiones tocadas que se quedaron sin filas dejan de figurar en la clave
+        nuevas_claves = set(zip(nuevas['PAIS'].astype(str), nuevas['ANIO'].astype(int)))
+        particiones = {clave: digest for clave, digest in previas.items() if clave not in nuevas_claves}
+        particiones.update(partition_hashes(parte))
+
+    log_validation(filepath, informe)
+    logger.info("🧩 Caché actualizada con %d filas nuevas: %s", len(nuevas), path)
+    write_cache(filepath, df, digest.hexdigest(), float_dtype, path, particiones, validation)
+    return df
+
+
+@timed('CleanData.load_headline_metrics')
+def load_headline_metrics(filepath, get_index, float_dtype='float64', validation='report'):
+    """Métricas de resultados por país y año (SplitDataSet.get_headline_metrics), guardadas junto al CSV.
+
+    `get_index` devuelve el índice del dataset y solo se llama si hay que recalcular. Cuando el CSV
+    cambió, se comparan los hashes por (país, año) de la caché del dataset con los que tenían las
+    métricas guardadas y solo se recalculan las particiones que cambiaron.
+    """
+    from SplitDataSet import SplitDataSet  # Importación interna: SplitDataSet solo hace falta para recalcular
+
+    path = metrics_cache_path(filepath)
+    metricas = read_cache(filepath, float_dtype, path, validation)
+    if metricas is not None:
+        return metricas
+
+    # Hashes actuales: los de la caché del dataset (completa o anual) que corresponda al CSV
+    particiones = None
+    for dataset in (cache_path(filepath), annual_cache_path(filepath)):
+        cached = _read_metadata(dataset)
+        if _stored_partitions(cached) is not None and _matches(filepath, cached, float_dtype, validation):
+            particiones = _stored_partitions(cached)
+            break
+
+    anterior, cambiadas = None, None
+    cached = _read_metadata(path)
+    previas = _stored_partitions(cached)
+    if particiones is not None and previas is not None and _same_options(cached, float_dtype, validation):
+        anterior = feather.read_table(path, memory_map=True).to_pandas()
+        cambiadas = {clave for clave in particiones.keys() | previas.keys() if particiones.get(clave) != previas.get(clave)}
+
+    metricas = SplitDataSet.get_headline_metrics(get_index(), anterior, cambiadas)
+    write_cache(filepath, metricas, float_dtype=float_dtype, path=path, partitions=particiones, validation=validation)
+    return metricas
+
+
+def log_diagnostics(df, diagnostics='off'):
+    """Calcula y registra los diagnósticos del DataFrame limpio según el nivel indicado.
+
+    Con 'off' no se calcula nada; 'summary' registra años, productos, países y nulos, y
+    'full' añade además la información de columnas y las estadísticas descriptivas. Cada
+    diagnóstico se envía a `logging` con su nombre, su resultado y lo que tardó en calcularse.
+    """
+    if diagnostics not in DIAGNOSTICS_LEVELS:
+        raise ValueError('Nivel de diagnóstico desconocido: %s (opciones: %s)' % (diagnostics, ', '.join(DIAGNOSTICS_LEVELS)))
+    if diagnostics == 'off':
+        return
+
+    checks = [
+        ('anios', '📆 AÑOS DISPONIBLES', lambda: df['ANIO'].unique().tolist()),
+        ('nulos', '🧼 VALORES NULOS POR COLUMNA', lambda: df.isnull().sum().to_dict()),
+        ('productos', '🔋 TIPOS DE PRODUCTOS ENERGÉTICOS', lambda: df['PRODUCTO'].unique().tolist()),
+        ('paises', '🌍 PAÍSES EN EL DATASET', lambda: df['PAIS'].unique().tolist()),
+    ]
+    if diagnostics == 'full':
+        def info():
+            buffer = io.StringIO()
+            df.info(buf=buffer)
+            return buffer.getvalue()
+
+        checks += [
+            ('info', '📊 INFORMACIÓN DEL DATASET', info),
+            ('estadisticas', '📈 ESTADÍSTICAS DESCRIPTIVAS', lambda: df.describe().to_dict()),
+        ]
+
+    for name, title, compute in checks:
+        start = time.perf_counter()
+        result = compute()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info('%s (%.1f ms)\n%s', title, elapsed_ms, result,
+                    extra={'diagnostico': name, 'resultado': result, 'duracion_ms': elapsed_ms})
+
+
+def _check_validation(validation):
+    if validation not in Validation.VALIDATION_ACTIONS:
+        raise ValueError('Acción de validación desconocida: %s (opciones: %s)' % (validation, ', '.join(Validation.VALIDATION_ACTIONS)))
+
+
+@timed('CleanData.validate_data')
+def validate_data(filepath, df, validation='report', append=False):
+    """Valida un DataFrame con las columnas de clean_columns y aplica la acción indicada.
+
+    Con 'off' no se valida; 'report' solo calcula el informe (ver Validation.validate); 'dedupe'
+    quita las copias anteriores de las claves repetidas y 'quarantine' quita además los acumulados
+    decrecientes y los guarda, con las columnas del CSV original, en `quarantine_path(filepath)`
+    (reemplazándolo, o añadiéndolas al final con `append`). Devuelve (DataFrame, informe); las filas
+    que quedan conservan su índice. Las sumas que no cuadran son por periodo y solo se informan.
+    """
+    _check_validation(validation)
+    if validation == 'off':
+        return df, None
+
+    informe, filas = Validation.validate(df)
+    descartar = Validation.rows_to_drop(filas, validation)
+    if validation == 'quarantine':
+        write_quarantine(filepath, df[descartar], append)
+    if descartar is not None and descartar.any():
+        df = df[~descartar]
+    return df, informe
+
+
+def write_quarantine(filepath, df, append=False):
+    """Guarda filas limpias en el archivo de cuarentena con las columnas y etiquetas del CSV original."""
+    path = quarantine_path(filepath)
+    if not append and os.path.exists(path):
+        os.remove(path)
+    if df.empty:
+        return
+
+    originales = {traducido: original for original, traducido in traducciones_productos.items()}
+    paises = {traducido: original for original, traducido in traducciones_paises.items()}
+    df = df.rename(columns={limpia: original for original, limpia in COLUMNAS_CSV.items()})[list(COLUMNAS_CSV)]
+    df = df.assign(COUNTRY=translate_categories(df['COUNTRY'], paises), PRODUCT=translate_categories(df['PRODUCT'], originales))
+    df.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+    logger.warning("🚧 %d filas en cuarentena: %s", len(df), path)
+
+
+def log_validation(filepath, informe):
+    # Registra el resumen del informe: como aviso si alguna regla falla, y el informe completo en `extra`
+    if informe is None:
+        return
+    nivel = logging.WARNING if Validation.has_violations(informe) else logging.INFO
+    logger.log(nivel, '🔎 Validación de %s (%d filas): %s', filepath, informe['filas'], Validation.summary(informe),
+               extra={'validacion': informe})
+
+
+@timed('CleanData.load_and_clean_data')
+def load_and_clean_data(filepath, use_cache=True, float_dtype='float64', diagnostics='off', validation='report'):
+    logger.info("📥 Leyendo el archivo: %s", filepath)
+    _check_validation(validation)
+
+    df = read_cache(filepath, float_dtype, validation=validation) if use_cache else None
+    if df is not None:
+        logger.info("📦 Usando la caché: %s", cache_path(filepath))
+    elif use_cache:
+        # Si al CSV solo se le añadieron filas, se limpian esas filas y se combinan con la caché
+        df = update_cache(filepath, float_dtype, validation=validation)
+
+    if df is None:
+        # El hash se calcula antes de leer para que la caché no quede asociada a un archivo modificado a mitad de lectura
+        sha256 = file_hash(filepath) if use_cache and pa is not None else None
+        # La validación va entre la lectura y el cálculo del porcentaje, que no debe ver filas descartadas
+        df, informe = validate_data(filepath, clean_columns(pd.read_csv(filepath, sep=','), float_dtype), validation)
+        log_validation(filepath, informe)
+        df = add_net_production_share(df.reset_index(drop=True), float_dtype)
+
+        if use_cache:
+            write_cache(filepath, df, sha256, float_dtype, partitions=partition_hashes(df), validation=validation)
+
+    log_diagnostics(df, diagnostics)
+    return df
+
+
+def reduce_to_annual(df):
+    """Conserva, por país y año, solo las filas del último mes disponible (el cubo anual)."""
+    ultimo_mes = df.groupby(['PAIS', 'ANIO'], observed=True)['MES'].transform('max')
+    return df[df['MES'] == ultimo_mes]
+
+
+def compact_annual(partes):
+    """Une bloques ya reducidos y vuelve a reducirlos al último mes por país y año.
+
+    Las categorías se unen como en una limpieza completa (ver `_concat_clean`), así que el cubo
+    tiene el mismo orden de categorías, y los mismos códigos, se calcule de una vez o por partes.
+    Las filas se ordenan por su índice, la posición en el CSV que conserva `whole_periods`, para que
+    el orden tampoco dependa de los bloques.
+    """
+    return reduce_to_annual(_concat_clean(partes, ignore_index=False)).sort_index(kind='stable')
+
+
+@timed('CleanData.load_annual_data')
+def load_annual_data(filepath, use_cache=True, float_dtype='float64', chunksize=CHUNKSIZE, validation='report'):
+    """Lee el CSV por bloques y devuelve solo el cubo anual, sin cargar nunca el archivo completo.
+
+    Cada bloque se limpia, se valida, se reduce al último mes por país y año y se combina con lo
+    acumulado, así que la memoria queda acotada por el tamaño del bloque y del cubo, no por el del
+    archivo. La validación se hace por bloque, sin repartir ningún periodo entre dos bloques, así que
+    una clave repetida en bloques distintos no se detecta. El resultado se guarda en Feather junto
+    al CSV y se reutiliza mientras el CSV no cambie.
+    """
+    _check_validation(validation)
+    path = annual_cache_path(filepath)
+    df = read_cache(filepath, float_dtype, path, validation) if use_cache else None
+    if df is not None:
+        logger.info("📦 Usando el cubo anual en caché: %s", path)
+        return df
+
+    df = update_cache(filepath, float_dtype, annual=True, validation=validation) if use_cache else None
+    if df is not None:
+        return df
+
+    logger.info("📥 Leyendo por bloques de %d filas: %s", chunksize, filepath)
+    sha256 = file_hash(filepath) if use_cache and pa is not None else None
+    # Los bloques reducidos se acumulan y se compactan cuando duplican el tamaño de la última compactación:
+    # así cada fila se vuelve a procesar un número acotado de veces y la memoria no pasa de unas veces el cubo
+    partes, filas, limite, informes = [], 0, chunksize, []
+    chunks = pd.read_csv(filepath, sep=',', chunksize=chunksize, dtype={'COUNTRY': 'category', 'PRODUCT': 'category'})
+    for chunk in whole_periods(clean_columns(chunk, float_dtype) for chunk in chunks):
+        chunk, informe = validate_data(filepath, chunk, validation, append=bool(informes))
+        informes.append(informe)
+        partes.append(reduce_to_annual(chunk))
+        filas += len(partes[-1])
+        if filas > limite:
+            partes = [compact_annual(partes)]
+            filas = len(partes[0])
+            limite = max(chunksize, 2 * filas)
+    cubo = compact_annual(partes).reset_index(drop=True)
+    log_validation(filepath, Validation.merge(informes))
+
+    # El porcentaje se calcula al final, cuando cada periodo del cubo tiene todas sus filas
+    df = add_net_production_share(cubo, float_dtype)
+    if use_cache:
+        write_cache(filepath, df, sha256, float_dtype, path, partition_hashes(df), validation)
+    return df
+
+
+def whole_periods(chunks):
+    """Bloques limpios en los que ningún periodo (país, año, mes) queda repartido entre dos bloques.
+
+    Las filas del último periodo de cada bloque pasan al siguiente, así la validación ve juntos
+    todos los productos de cada periodo aunque el CSV se lea por partes. Las filas conservan su
+    índice (la posición en el CSV con `pd.read_csv(chunksize=...)`), con el que `compact_annual`
+    recupera el orden del archivo.
+    """
+    resto = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if resto is not None:
+            chunk = _concat_clean([resto, chunk], ignore_index=False)
+        ultimo = chunk.iloc[-1]
+        es_ultimo = (chunk['PAIS'] == ultimo['PAIS']) & (chunk['ANIO'] == ultimo['ANIO']) & (chunk['MES'] == ultimo['MES'])
+        if es_ultimo.all():
+            resto = chunk
+            continue
+        resto = chunk[es_ultimo]
+        yield chunk[~es_ultimo]
+    if resto is not None:
+        yield resto
+
+
+def translate_categories(serie, traducciones):
+    """Traduce las etiquetas de una columna categórica, dejando igual las que no tienen traducción."""
+    return serie.cat.rename_categories(lambda etiqueta: traducciones.get(etiqueta, etiqueta))
+
+
+@timed('CleanData.clean_data')
+def clean_data(df, float_dtype='float64'):
+    return add_net_production_share(clean_columns(df, float_dtype), float_dtype)
+
+
+def clean_columns(df, float_dtype='float64'):
     # Renombrar columnas
-    df = df.rename(columns={
-        "COUNTRY": "PAIS",
-        "YEAR": "ANIO",
-        "MONTH": "MES",
-        "PRODUCT": "PRODUCTO",
-        "VALUE": "ELECTRICIDAD_GENERADA_GWH",
-        "yearToDate": "ELECTRICIDAD_GENERADA_ACUMULADA"
-    })
-
-    # Traducir PRODUCTOS
-    traducciones_productos = {
-        'Hydro': 'Hidroeléctrica',
-        'Wind': 'Eólica',
-        'Solar': 'Solar',
-        'Geothermal': 'Geotérmica',
-        'Other renewables': 'Otras renovables',
-        'Nuclear': 'Nuclear',
-        'Total combustible fuels': 'Total combustibles',
-        'Coal': 'Carbón',
-        'Oil': 'Petróleo',
-        'Natural gas': 'Gas natural',
-        'Combustible renewables': 'Renovables combustibles',
-        'Other combustible non-renewables': 'Otros no renovables combustibles',
-        'Not specified': 'No especificado',
-        'Net electricity production': 'Producción neta de electricidad',
-        'Total imports': 'Importaciones totales',
-        'Total exports': 'Exportaciones totales',
-        'Electricity supplied': 'Electricidad suministrada',
-        'Used for pumped storage': 'Usado para almacenamiento por bombeo',
-        'Distribution losses': 'Pérdidas de distribución',
-        'Final consumption': 'Consumo final',
-        'Electricity trade': 'Intercambio de electricidad',
-        'Renewables': 'Renovables',
-        'Non-renewables': 'No renovables',
-        'Others': 'Otros',
-        'Other renewables aggregated': 'Otras renovables agregadas',
-        'Low carbon': 'Bajo carbono',
-        'Fossil fuels': 'Combustibles fósiles'
-    }
-    df['PRODUCTO'] = df['PRODUCTO'].replace(traducciones_productos)
-
-    # Mostrar productos únicos
-    print("\n🔋 TIPOS DE PRODUCTOS ENERGÉTICOS")
-    print("-" * 40)
-    print(df['PRODUCTO'].unique())
-
-    # Traducir PAÍSES
-    traducciones_paises = {
-        'Argentina': 'Argentina',
-        'Brazil': 'Brasil',
-        'Canada': 'Canadá',
-        'Chile': 'Chile',
-        'Colombia': 'Colombia',
-        'Mexico': 'México',
-        'United States': 'Estados Unidos',
-        'Costa Rica': 'Costa Rica'
-    }
-    df['PAIS'] = df['PAIS'].replace(traducciones_paises)
-
-    # Mostrar países únicos
-    print("\n🌍 PAÍSES EN EL DATASET")
-    print("-" * 40)
-    print(df['PAIS'].unique())
-
-    # Info general del DataFrame
-    print("\n📊 INFORMACIÓN DEL DATASET")
-    print("-" * 40)
-    print(df.info())
-
-    # Resumen estadístico
-    print("\n📈 ESTADÍSTICAS DESCRIPTIVAS")
-    print("-" * 40)
-    print(df.describe())
+    df = df.rename(columns=COLUMNAS_CSV)
 
+    df = df.astype(ESQUEMA)
+    df[COLUMNAS_VALORES[:2]] = df[COLUMNAS_VALORES[:2]].astype(float_dtype)
+
+    # Traducir PRODUCTOS renombrando las categorías (una vez por etiqueta, no por fila)
+    df['PRODUCTO'] = translate_categories(df['PRODUCTO'], traducciones_productos)
+
+    df['PAIS'] = translate_categories(df['PAIS'], traducciones_paises)
+
+    return df
+
+
+def add_net_production_share(df, float_dtype='float64'):
     # ================================
     # 🔍 Agregar columna de porcentaje
     # ================================
 
-    # Filtrar Colombia
-    filtro = (df['PAIS'] == 'Colombia') & (df['MES'] == 12)
+    # Cada fila se divide por la producción neta acumulada del mismo país, año y mes; los periodos
+    # sin fila de producción neta quedan en NaN
+    es_neta = df['PRODUCTO'] == 'Producción neta de electricidad'
+    if not es_neta.any():
+        logger.warning("⚠️ No se encontró 'Producción neta de electricidad' en los datos. El porcentaje queda vacío.")
 
-    # Obtener el valor de producción neta de electricidad en ese periodo
-    prod_neta = df.loc[filtro & (df['PRODUCTO'] == 'Producción neta de electricidad'), 'ELECTRICIDAD_GENERADA_ACUMULADA']
+    prod_neta = (
+        df['ELECTRICIDAD_GENERADA_ACUMULADA'].where(es_neta)
+        .groupby([df['PAIS'], df['ANIO'], df['MES']], observed=True)
+        .transform('first')
+    )
+    df['PORCENTAJE_SOBRE_PRODUCCION_NETA'] = (
+        df['ELECTRICIDAD_GENERADA_ACUMULADA'] / prod_neta * 100
+    ).astype(float_dtype)
 
-    if not prod_neta.empty:
-        valor_prod_neta = prod_neta.values[0]
+    return df
 
-        # Solo para registros de Colombia, calcular porcentaje
-        df.loc[filtro, 'PORCENTAJE_SOBRE_PRODUCCION_NETA'] = (
-            df.loc[filtro, 'ELECTRICIDAD_GENERADA_ACUMULADA'] / valor_prod_neta
-        ) * 100
-    else:
-        print("⚠️ No se encontró 'Producción neta de electricidad' para Colombia en diciembre 2024. No se generó columna de porcentaje.")
 
-    return df
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Carga y limpia el dataset mostrando sus diagnósticos.')
+    parser.add_argument('filepath', nargs='?', default='DataSet.csv', help='Archivo CSV a limpiar')
+    parser.add_argument('--diagnostics', choices=DIAGNOSTICS_LEVELS, default='full', help='Nivel de diagnóstico')
+    parser.add_argument('--validation', choices=Validation.VALIDATION_ACTIONS, default='report', help='Acción de la validación de calidad')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    load_and_clean_data(args.filepath, diagnostics=args.diagnostics, validation=args.validation)
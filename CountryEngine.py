@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from SplitDataSet import FUENTES_ENERGIA, SplitDataSet
+
+# pyarrow es opcional: sin él las tablas por país se calculan siempre en serie
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Tablas derivadas que se calculan para cada país
+TABLAS = ('fuentes', 'matriz', 'produccion_neta')
+
+# Lotes por proceso: más de uno por proceso para repartir bien la carga cuando los países no pesan igual
+LOTES_POR_PROCESO = 4
+
+
+def _by_country(table, countries):
+    # Filas agrupadas por país en el orden del lote, conservando el orden original dentro de cada país
+    orden = {country: i for i, country in enumerate(countries)}
+    return table.iloc[np.argsort(table['PAIS'].astype(str).map(orden).to_numpy(), kind='stable')]
+
+
+def batch_tables(df, countries, year=2024):
+    """Tablas de varios países a partir de las filas de esos países, con una sola llamada vectorizada por tabla.
+
+    Cada tabla se calcula para todo el lote a la vez con las funciones de SplitDataSet que aceptan
+    varios países: distribución de fuentes, filas de la matriz de fuentes y uso de la producción neta.
+    Las filas quedan agrupadas por país en el orden de `countries`.
+    """
+    index = SplitDataSet.build_index(df)
+
+    fuentes = SplitDataSet.select(index, FUENTES_ENERGIA, countries=countries, years=[year])
+    total = fuentes.groupby('PAIS', observed=True)['ELECTRICIDAD_GENERADA_ACUMULADA'].transform('sum')
+    fuentes = fuentes.assign(Porcentaje=fuentes['ELECTRICIDAD_GENERADA_ACUMULADA'] / total * 100)
+
+    # Índice desde 0 en cada país, como la tabla de un solo país: así no depende de cómo se agrupen los países en lotes
+    neta = _by_country(SplitDataSet.get_distribution_over_net_production(index, countries=countries), countries)
+    neta.index = neta.groupby('PAIS', sort=False).cumcount().to_numpy()
+
+    return {
+        'fuentes': _by_country(fuentes, countries),
+        'matriz': SplitDataSet.get_energy_source_matrix(index, year=year, countries=list(countries)),
+        'produccion_neta': neta,
+    }
+
+
+def _partition(cube, workers):
+    """Ordena el cubo por país y lo parte en lotes contiguos de países: [(inicio, fin, países), ...]."""
+    cube = cube.sort_values('PAIS', kind='stable')
+    sizes = cube.groupby('PAIS', observed=True, sort=True).size()
+    bounds = [0] + sizes.cumsum().tolist()
+    countries = list(sizes.index)
+
+    n = max(1, min(len(countries), workers * LOTES_POR_PROCESO))
+    cuts = [round(i * len(countries) / n) for i in range(n + 1)]
+    batches = [(bounds[a], bounds[b], countries[a:b]) for a, b in zip(cuts, cuts[1:]) if b > a]
+    return cube, batches
+
+
+def _to_ipc(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+# Estado de cada proceso del pool: el cubo leído sin copia desde la memoria compartida
+_shared = {}
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    _shared['shm'] = shm
+    _shared['cube'] = pa.ipc.open_stream(pa.py_buffer(shm.buf)).read_all()
+
+
+def _run_batch(start, stop, countries, year):
+    # Solo las filas del lote pasan a pandas; el resultado vuelve como Arrow IPC
+    df = _shared['cube'].slice(start, stop - start).to_pandas()
+    tables = batch_tables(df, countries, year)
+    return {name: _to_ipc(pa.Table.from_pandas(table)).to_pybytes() for name, table in tables.items()}
+
+
+def compute_country_tables(df, year=2024, workers=1):
+    """Calcula las tablas derivadas de todos los países, en serie o repartidas por país en un pool de procesos.
+
+    El cubo anual se escribe una vez en memoria compartida como Arrow IPC y cada proceso lo
+    lee sin copiarlo; cada lote de países se calcula con las mismas funciones que en serie,
+    así que el resultado es idéntico con cualquier número de procesos.
+    """
+    cube, batches = _partition(SplitDataSet.get_annual_cube(df), workers)
+    if workers <= 1 or pa is None or len(batches) <= 1:
+        results = [batch_tables(cube.iloc[start:stop], countries, year) for start, stop, countries in batches]
+        return {name: pd.concat([result[name] for result in results]) for name in TABLAS}
+
+    buffer = _to_ipc(pa.Table.from_pandas(cube))
+    shm = shared_memory.SharedMemory(create=True, size=buffer.size)
+    try:
+        shm.buf[:buffer.size] = memoryview(buffer).cast('B')
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shm.name,)) as pool:
+            futures = [pool.submit(_run_batch, start, stop, countries, year) for start, stop, countries in batches]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return {
+        name: pd.concat([pa.ipc.open_stream(result[name]).read_all().to_pandas() for result in results])
+        for name in TABLAS
+    }
+
+
+def default_workers():
+    """Número de procesos por defecto: los núcleos disponibles para este proceso."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
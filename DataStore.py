@@ -0,0 +1,176 @@
+import os
+import json
+import sqlite3
+import contextlib
+import pandas as pd
+
+from CleanData import CHUNKSIZE, clean_columns, clean_data, source_key, traducciones_paises, traducciones_productos
+from SplitDataSet import ANIOS, MES_CIERRE
+
+# Columnas tal como llegan de la API y del CSV; la tabla guarda los datos sin traducir
+COLUMNAS = ['COUNTRY', 'YEAR', 'MONTH', 'PRODUCT', 'VALUE', 'yearToDate']
+
+PRODUCTO_NETA = 'Net electricity production'
+
+ESQUEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS energia (
+    COUNTRY TEXT NOT NULL,
+    YEAR INTEGER NOT NULL,
+    MONTH INTEGER NOT NULL,
+    PRODUCT TEXT NOT NULL,
+    VALUE REAL,
+    yearToDate REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS energia_clave ON energia (COUNTRY, YEAR, MONTH, PRODUCT);
+CREATE INDEX IF NOT EXISTS energia_producto ON energia (PRODUCT, YEAR, MONTH);
+CREATE TABLE IF NOT EXISTS ultimo_mes (
+    COUNTRY TEXT NOT NULL,
+    YEAR INTEGER NOT NULL,
+    MONTH INTEGER NOT NULL,
+    PRIMARY KEY (COUNTRY, YEAR)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fuentes (path TEXT PRIMARY KEY, clave TEXT NOT NULL);
+'''
+
+# Inserta o actualiza por (COUNTRY, YEAR, MONTH, PRODUCT); la fila conserva su posición original
+UPSERT_SQL = '''
+INSERT INTO energia (COUNTRY, YEAR, MONTH, PRODUCT, VALUE, yearToDate) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (COUNTRY, YEAR, MONTH, PRODUCT) DO UPDATE SET VALUE = excluded.VALUE, yearToDate = excluded.yearToDate
+'''
+
+# Último mes publicado por país y año, mantenido en cada upsert para que las vistas anuales no recorran la tabla
+ULTIMO_MES_SQL = '''
+INSERT INTO ultimo_mes (COUNTRY, YEAR, MONTH) VALUES (?, ?, ?)
+ON CONFLICT (COUNTRY, YEAR) DO UPDATE SET MONTH = MAX(MONTH, excluded.MONTH)
+'''
+
+# Traducciones inversas para llevar los filtros de las vistas (en español) a los valores de la tabla
+productos_originales = {traducido: original for original, traducido in traducciones_productos.items()}
+paises_originales = {traducido: original for original, traducido in traducciones_paises.items()}
+
+
+def database_path(filepath):
+    """Ruta de la base SQLite que acompaña a un CSV (DataSet.csv -> DataSet.sqlite)."""
+    return os.path.splitext(filepath)[0] + '.sqlite'
+
+
+def _placeholders(values):
+    return ', '.join('?' * len(values))
+
+
+def _where(conditions):
+    return 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+
+class SQLiteStore:
+    """Almacén SQLite del dataset con la misma interfaz de consulta que DataSetIndex.
+
+    Cada consulta se resuelve en SQL (filtro por producto, país, año y mes, y el último mes
+    publicado por país y año para las vistas anuales) y solo se traen a pandas las filas
+    pedidas, ya limpias y traducidas. Cada operación abre su propia conexión, así que un
+    mismo almacén puede usarse desde varios hilos.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as con:
+            # WAL permite que el dashboard lea mientras el scraper escribe
+            con.execute('PRAGMA journal_mode=WAL')
+            con.executescript(ESQUEMA_SQL)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path)
+        con.execute('PRAGMA synchronous=NORMAL')
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def upsert(self, rows):
+        """Inserta o actualiza filas (diccionarios o tuplas con las columnas de COLUMNAS). Devuelve cuántas recibió."""
+        rows = [tuple(row[column] for column in COLUMNAS) if isinstance(row, dict) else tuple(row) for row in rows]
+        ultimo = {}
+        for country, year, month, *_ in rows:
+            key = (country, int(year))
+            ultimo[key] = max(ultimo.get(key, 0), int(month))
+
+        with self._connect() as con:
+            con.executemany(UPSERT_SQL, rows)
+            con.executemany(ULTIMO_MES_SQL, [key + (month,) for key, month in ultimo.items()])
+        return len(rows)
+
+    def sync_csv(self, filepath, chunksize=CHUNKSIZE):
+        """Carga un CSV si cambió desde la última carga; gracias al upsert, recargarlo no duplica filas."""
+        key = json.dumps(source_key(filepath))
+        with self._connect() as con:
+            loaded = con.execute('SELECT clave FROM fuentes WHERE path = ?', (os.path.abspath(filepath),)).fetchone()
+        if loaded is not None and loaded[0] == key:
+            return 0
+
+        rows = 0
+        for chunk in pd.read_csv(filepath, sep=',', chunksize=chunksize):
+            rows += self.upsert(chunk[COLUMNAS].itertuples(index=False, name=None))
+        with self._connect() as con:
+            con.execute('INSERT OR REPLACE INTO fuentes (path, clave) VALUES (?, ?)', (os.path.abspath(filepath), key))
+        return rows
+
+    @property
+    def years(self):
+        with self._connect() as con:
+            return [year for (year,) in con.execute('SELECT DISTINCT YEAR FROM energia ORDER BY YEAR')]
+
+    def query(self, products=None, countries=None, years=None, month=MES_CIERRE):
+        """Filas limpias que cumplen el filtro; con `month` None, solo el último mes de cada país y año."""
+        # Con `month` None se recorre ultimo_mes (un registro por país y año) y sus filas se buscan por la clave
+        # única; CROSS JOIN obliga a SQLite a mantener ese orden en lugar de recorrer el índice por producto
+        origen, tabla = ('FROM energia e', 'e') if month is not None else ('FROM ultimo_mes u CROSS JOIN energia e USING (COUNTRY, YEAR, MONTH)', 'u')
+
+        # El primer parámetro es el producto del LEFT JOIN; los del WHERE van después, en su orden
+        where, params = [], [PRODUCTO_NETA]
+        if countries is not None:
+            countries = [paises_originales.get(country, country) for country in countries]
+            where.append('%s.COUNTRY IN (%s)' % (tabla, _placeholders(countries)))
+            params += countries
+        if years is not None:
+            years = [int(year) for year in years]
+            where.append('%s.YEAR IN (%s)' % (tabla, _placeholders(years)))
+            params += years
+        if month is not None:
+            where.append('e.MONTH = ?')
+            params.append(int(month))
+        if products is not None:
+            products = [productos_originales.get(product, product) for product in products]
+            where.append('e.PRODUCT IN (%s)' % _placeholders(products))
+            params += products
+
+        sql = '''
+            SELECT e.COUNTRY, e.YEAR, e.MONTH, e.PRODUCT, e.VALUE, e.yearToDate,
+                   e.yearToDate * 100.0 / n.yearToDate AS PORCENTAJE_SOBRE_PRODUCCION_NETA
+            %s
+            LEFT JOIN energia n ON n.COUNTRY = e.COUNTRY AND n.YEAR = e.YEAR AND n.MONTH = e.MONTH AND n.PRODUCT = ?
+            %s
+            ORDER BY e.rowid
+        ''' % (origen, _where(where))
+
+        with self._connect() as con:
+            df = pd.read_sql_query(sql, con, params=params)
+        share = df.pop('PORCENTAJE_SOBRE_PRODUCCION_NETA')
+        df = clean_columns(df)
+        df['PORCENTAJE_SOBRE_PRODUCCION_NETA'] = share.astype('float64')
+        return df
+
+    def select(self, products, countries=None, years=ANIOS, month=MES_CIERRE):
+        """Misma firma que DataSetIndex.select; `years` None indica todos los años."""
+        return self.query(products, countries, years, month)
+
+    @property
+    def annual(self):
+        return self.query()
+
+    @property
+    def df(self):
+        with self._connect() as con:
+            df = pd.read_sql_query('SELECT %s FROM energia ORDER BY rowid' % ', '.join(COLUMNAS), con)
+        return clean_data(df)
@@ -1,13 +1,50 @@
-import plotly.express as px
-import plotly.graph_objects as go  # Asegúrate de que esté importado arriba junto con plotly.express
+import math
+
+from Profiling import timed
+
+# plotly se importa dentro de cada gráfico: importar este módulo no lo carga y las secciones
+# que no dibujan (o que se sirven desde la caché) no pagan su tiempo de importación
+
+
+# Por encima de este número de puntos los gráficos de líneas se dibujan con WebGL (Scattergl)
+UMBRAL_WEBGL = 1000
+
+# Máximo de puntos por serie; las series más largas se diezman conservando su primer y último punto
+MAX_PUNTOS_SERIE = 500
 
 
 class GraphicsView:
 
     @staticmethod
+    def _slim(df, columns, value):
+        """Deja solo las columnas que usa el gráfico y reduce la columna de valores a float32."""
+        data = df[list(dict.fromkeys(columns))]
+        return data.astype({value: 'float32'})
+
+    @staticmethod
+    def _decimate(data, color):
+        """Reduce cada serie a como máximo MAX_PUNTOS_SERIE puntos tomando uno de cada `paso`."""
+        grupos = data.groupby(color, observed=True, sort=False)
+        posicion = grupos.cumcount().to_numpy()
+        tamano = grupos[color].transform('size').to_numpy()
+        paso = -(-tamano // MAX_PUNTOS_SERIE)  # División entera hacia arriba
+        return data[(posicion % paso == 0) | (posicion == tamano - 1)]
+
+    @staticmethod
+    def _line(df, x, y, color, **kwargs):
+        """Gráfico de líneas con los datos mínimos; usa WebGL y diezmado cuando hay muchos puntos."""
+        data = GraphicsView._slim(df, [x, y, color], y)
+        if len(data) > UMBRAL_WEBGL:
+            data = GraphicsView._decimate(data, color)
+            kwargs['render_mode'] = 'webgl'
+        import plotly.express as px
+        return px.line(data, x=x, y=y, color=color, **kwargs)
+
+    @staticmethod
+    @timed('GraphicsView.plot_renewable_trend')
     def plot_renewable_trend(df_energy):
         """Evolución de energía renovable en América Latina (2020-2024)."""
-        fig = px.line(
+        fig = GraphicsView._line(
             df_energy,
             x='ANIO',
             y='ELECTRICIDAD_GENERADA_ACUMULADA',
@@ -20,9 +57,10 @@ class GraphicsView:
         return fig
 
     @staticmethod
+    @timed('GraphicsView.plot_non_renewable_trend')
     def plot_non_renewable_trend(df_energy):
         """Evolución de energía no renovable en América Latina (2020-2024)."""
-        fig = px.line(
+        fig = GraphicsView._line(
             df_energy,
             x='ANIO',
             y='ELECTRICIDAD_GENERADA_ACUMULADA',
@@ -35,9 +73,10 @@ class GraphicsView:
         return fig
 
     @staticmethod
+    @timed('GraphicsView.plot_colombia_trade')
     def plot_colombia_trade(data):
         """Exportaciones, importaciones y producción eléctrica en Colombia (2020-2024)."""
-        return px.line(
+        return GraphicsView._line(
             data,
             x="ANIO",
             y="ELECTRICIDAD_GENERADA_ACUMULADA",
@@ -46,10 +85,12 @@ class GraphicsView:
         )
 
     @staticmethod
+    @timed('GraphicsView.plot_colombia_energy_export')
     def plot_colombia_energy_export(df_colombia):
         """Producción vs exportación eléctrica en Colombia (2020-2024)."""
+        import plotly.express as px
         fig = px.bar(
-            df_colombia,
+            GraphicsView._slim(df_colombia, ['ANIO', 'ELECTRICIDAD_GENERADA_ACUMULADA', 'PRODUCTO'], 'ELECTRICIDAD_GENERADA_ACUMULADA'),
             x='ANIO',
             y='ELECTRICIDAD_GENERADA_ACUMULADA',
             color='PRODUCTO',
@@ -61,10 +102,12 @@ class GraphicsView:
         return fig
 
     @staticmethod
+    @timed('GraphicsView.plot_distribution_over_net_production_colombia')
     def plot_distribution_over_net_production_colombia(df_distribution):
         """Distribución porcentual sobre producción neta en Colombia."""
+        import plotly.express as px
         fig = px.bar(
-            df_distribution,
+            GraphicsView._slim(df_distribution, ['año', '% sobre Producción Neta', 'Categoría Energética'], '% sobre Producción Neta'),
             x="año",
             y="% sobre Producción Neta",
             color="Categoría Energética",
@@ -75,9 +118,10 @@ class GraphicsView:
         return fig
 
     @staticmethod
+    @timed('GraphicsView.plot_renewable_and_nonrenewable_data')
     def plot_renewable_and_nonrenewable_data(df_colombia):
         """Energías renovable y no renovable en Colombia (2020-2024)."""
-        return px.line(
+        return GraphicsView._line(
             df_colombia,
             x="ANIO",
             y="ELECTRICIDAD_GENERADA_ACUMULADA",
@@ -86,40 +130,43 @@ class GraphicsView:
         )
 
     @staticmethod
+    @timed('GraphicsView.plot_energy_source_distribution')
     def plot_energy_source_distribution(df_dist):
         """Distribución porcentual de fuentes de energía en Colombia (2024)."""
+        import plotly.express as px
         return px.pie(
-            df_dist,
+            GraphicsView._slim(df_dist, ['PRODUCTO', 'Porcentaje'], 'Porcentaje'),
             names='PRODUCTO',
             values='Porcentaje',
             hole=0.4
         )
 
     @staticmethod
+    @timed('GraphicsView.plot_radar_energy_comparison')
     def plot_radar_energy_comparison(df, selected_countries, year=2024):
         """Gráfico radar comparando la distribución porcentual de fuentes de energía entre varios países en un año específico."""
 
+        import plotly.graph_objects as go
         from SplitDataSet import SplitDataSet  # Importación interna para evitar dependencia circular
 
-        categorias = ['Hidroeléctrica', 'Solar', 'Renovables combustibles', 'Carbón', 'Petróleo', 'Gas natural', 'Otras renovables agregadas']
+        # Matriz país × fuente calculada en una sola pasada para todos los países seleccionados
+        matriz = SplitDataSet.get_energy_source_matrix(df, year=year, countries=list(selected_countries))
+        categorias = list(matriz.columns)
         fig = go.Figure()
 
-        for country in selected_countries:
-            data = SplitDataSet.get_energy_source_distribution(df, year=year, country=country)
-
-            # Asegura que todas las categorías estén presentes
-            valores = [data.loc[data['PRODUCTO'] == c, 'Porcentaje'].values[0] if c in data['PRODUCTO'].values else 0 for c in categorias]
-
+        for country, valores in matriz.iterrows():
             fig.add_trace(go.Scatterpolar(
-                r=valores,
+                r=valores.tolist(),
                 theta=categorias,
                 fill='toself',
                 name=country
             ))
 
+        # El rango del eje radial se ajusta al mayor porcentaje, redondeado a la decena superior
+        maximo = matriz.to_numpy().max() if matriz.size else 0
         fig.update_layout(
             polar=dict(
-                radialaxis=dict(visible=True, range=[0, 90])
+                radialaxis=dict(visible=True, range=[0, max(10, math.ceil(maximo / 10) * 10)])
             ),
             showlegend=True,
             template='plotly_white'
@@ -0,0 +1,184 @@
+"""
+Instrumentación ligera de las etapas del dashboard (carga, limpieza, filtros y gráficos).
+
+`timed` se usa como decorador o como administrador de contexto y registra, por etapa, el tiempo
+de reloj, las filas de entrada y de salida y la variación de memoria residente. Desactivado (el
+valor por defecto) solo comprueba una bandera antes de llamar a la función original.
+
+Se activa con la variable de entorno ENERGIA_PROFILING=1 o con `enable()`. Los registros se
+exportan como líneas JSON (`to_jsonl`) o en el formato de texto de Prometheus (`to_prometheus`).
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+import collections
+
+# Registros recientes (acotados) y totales acumulados por etapa desde que arrancó el proceso
+MAX_RECORDS = 2000
+
+_lock = threading.Lock()
+_records = collections.deque(maxlen=MAX_RECORDS)
+_totals = collections.defaultdict(lambda: {'llamadas': 0, 'segundos': 0.0, 'filas_entrada': 0, 'filas_salida': 0})
+_sequence = 0
+_enabled = os.environ.get('ENERGIA_PROFILING', '') not in ('', '0')
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def enable(value=True):
+    global _enabled
+    _enabled = bool(value)
+
+
+def is_enabled():
+    return _enabled
+
+
+def _rss():
+    # Memoria residente actual en bytes (Linux); None donde /proc no existe
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _is_frame(value):
+    return hasattr(value, 'shape') and hasattr(value, 'index')
+
+
+def _rows(value):
+    # Filas de un DataFrame o Series, o del DataFrame guardado en un índice de SplitDataSet; None para lo demás.
+    # El DataFrame se busca en los atributos de la instancia y nunca con getattr: en SQLiteStore `df` es una
+    # propiedad que lee y limpia toda la tabla, y contar filas no debe costar más que la etapa medida
+    if _is_frame(value):
+        return len(value)
+    df = vars(value).get('df') if hasattr(value, '__dict__') else None
+    return len(df) if _is_frame(df) else None
+
+
+class _Stage:
+    """Medición en curso de una etapa; `rows_out` puede fijarse dentro del bloque `with`."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        self._rss = _rss()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        rss = _rss()
+        _record(self.name, elapsed, self.rows_in, self.rows_out,
+                None if rss is None or self._rss is None else rss - self._rss)
+
+
+def _record(name, elapsed, rows_in, rows_out, memory_delta):
+    global _sequence
+    with _lock:
+        _sequence += 1
+        _records.append({
+            'secuencia': _sequence,
+            'etapa': name,
+            'inicio': time.time() - elapsed,
+            'ms': round(elapsed * 1000, 3),
+            'filas_entrada': rows_in,
+            'filas_salida': rows_out,
+            'memoria_kb': None if memory_delta is None else memory_delta // 1024,
+            'hilo': threading.get_ident(),
+        })
+        total = _totals[name]
+        total['llamadas'] += 1
+        total['segundos'] += elapsed
+        total['filas_entrada'] += rows_in or 0
+        total['filas_salida'] += rows_out or 0
+
+
+def timed(name):
+    """Decorador o administrador de contexto que mide una etapa.
+
+    Como decorador, las filas de entrada son las del primer argumento y las de salida las del
+    resultado (si son DataFrames o índices). Como administrador de contexto devuelve un objeto en
+    el que pueden fijarse `rows_in` y `rows_out`, y no mide nada si el perfilado está desactivado.
+    """
+    return _Timer(name)
+
+
+class _Timer:
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(name, _rows(args[0]) if args else None) as stage:
+                result = func(*args, **kwargs)
+                stage.rows_out = _rows(result)
+            return result
+        return wrapper
+
+    def __enter__(self):
+        # Desactivado se devuelve el propio temporizador, para que asignar rows_in/rows_out no falle
+        self._stage = _Stage(self.name) if _enabled else None
+        return self if self._stage is None else self._stage.__enter__()
+
+    def __exit__(self, *exc):
+        if self._stage is not None:
+            self._stage.__exit__(*exc)
+
+
+def mark():
+    """Número del último registro; sirve para pedir después solo los registros posteriores."""
+    return _sequence
+
+
+def records(since=0, thread=None):
+    """Registros posteriores a `since`, opcionalmente solo los de un hilo (p. ej. la ejecución actual de Streamlit)."""
+    with _lock:
+        return [record for record in _records
+                if record['secuencia'] > since and (thread is None or record['hilo'] == thread)]
+
+
+def reset():
+    global _sequence
+    with _lock:
+        _records.clear()
+        _totals.clear()
+        _sequence = 0
+
+
+def to_jsonl(rows=None):
+    """Registros como líneas JSON (una por etapa medida)."""
+    rows = records() if rows is None else rows
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in rows)
+
+
+def to_prometheus():
+    """Totales por etapa en el formato de texto de exposición de Prometheus."""
+    metrics = [
+        ('energia_etapa_llamadas_total', 'counter', 'Llamadas medidas por etapa', 'llamadas'),
+        ('energia_etapa_segundos_total', 'counter', 'Tiempo de reloj acumulado por etapa', 'segundos'),
+        ('energia_etapa_filas_entrada_total', 'counter', 'Filas de entrada acumuladas por etapa', 'filas_entrada'),
+        ('energia_etapa_filas_salida_total', 'counter', 'Filas de salida acumuladas por etapa', 'filas_salida'),
+    ]
+    with _lock:
+        totals = {name: dict(total) for name, total in _totals.items()}
+
+    lines = []
+    for metric, kind, help_text, key in metrics:
+        lines += ['# HELP %s %s' % (metric, help_text), '# TYPE %s %s' % (metric, kind)]
+        for name in sorted(totals):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append('%s{etapa="%s"} %s' % (metric, label, repr(float(totals[name][key])) if key == 'segundos' else totals[name][key]))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,236 @@
+"""
+Actualización del dataset en segundo plano.
+
+Cada ejecución copia el CSV a un archivo de preparación (DataSet.csv.staging), descarga ahí lo que
+falta con WebScrapy, valida el resultado, deja listas sus cachés Feather y reemplaza el CSV con
+`os.replace`, que es atómico: el dashboard siempre lee la versión anterior completa o la nueva
+completa, nunca un archivo a medio escribir. Como la versión del archivo (fecha de modificación y
+tamaño) forma parte de las claves de caché del dashboard, el cambio se toma en la siguiente ejecución.
+
+Se usa desde el dashboard (`RefreshWorker`, con ENERGIA_REFRESH_INTERVAL en segundos) o como proceso
+aparte, por ejemplo desde cron: `python Refresh.py --once`.
+"""
+
+import os
+import time
+import shutil
+import logging
+import argparse
+import threading
+import pandas as pd
+
+import WebScrapy
+import Validation
+from CleanData import (CHUNKSIZE, STREAMING_MIN_BYTES, annual_cache_path, cache_path, clean_columns, load_and_clean_data,
+                       load_annual_data, load_headline_metrics, log_validation, metrics_cache_path, source_key, whole_periods)
+from SplitDataSet import SplitDataSet
+
+# fcntl solo existe en sistemas POSIX: sin él no se evita que dos procesos actualicen a la vez
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Intervalo por defecto entre actualizaciones, en segundos
+REFRESH_INTERVAL = 6 * 60 * 60
+
+# Archivos auxiliares del scraper que acompañan al CSV (manifiesto de progreso y listas de la API)
+SCRAPER_FILES = (WebScrapy.checkpoint_path, WebScrapy.lists_cache_path)
+
+
+def staging_path(filepath):
+    """Ruta del archivo de preparación donde se descargan los datos nuevos antes de publicarlos."""
+    return filepath + '.staging'
+
+
+def lock_path(filepath):
+    return filepath + '.refresh.lock'
+
+
+def validate_dataset(path, min_rows=0, chunksize=CHUNKSIZE):
+    """Comprueba que el CSV preparado se pueda publicar; lanza ValueError si no.
+
+    Exige las columnas del scraper, claves completas, meses entre 1 y 12 y al menos `min_rows`
+    filas (una actualización nunca debe dejar menos datos de los que había). El archivo se lee por
+    bloques, como en `load_annual_data`, y a cada bloque se le aplican además las reglas de
+    Validation, cuyo informe se registra y se devuelve: las filas que no las cumplen no impiden
+    publicar, porque la limpieza las trata según su acción de validación.
+    """
+    with open(path) as f:
+        columnas = f.readline().rstrip('\n').split(',')
+    if columnas != WebScrapy.header:
+        raise ValueError('Columnas inesperadas en %s: %s' % (path, columnas))
+
+    def bloques():
+        for chunk in pd.read_csv(path, sep=',', chunksize=chunksize, dtype={'COUNTRY': 'category', 'PRODUCT': 'category'}):
+            if chunk[['COUNTRY', 'YEAR', 'MONTH', 'PRODUCT']].isnull().any().any():
+                raise ValueError('%s tiene filas sin país, año, mes o producto' % path)
+            if not chunk['MONTH'].between(1, 12).all():
+                raise ValueError('%s tiene meses fuera del rango 1-12' % path)
+            yield clean_columns(chunk)
+
+    informe = Validation.merge([Validation.validate(chunk)[0] for chunk in whole_periods(bloques())])
+    filas = informe['filas'] if informe else 0
+    if filas < min_rows:
+        raise ValueError('%s tiene %d filas, menos que las %d publicadas' % (path, filas, min_rows))
+    log_validation(path, informe)
+    return informe
+
+
+def count_rows(filepath):
+    """Filas de datos del CSV publicado (sin el encabezado); 0 si todavía no existe."""
+    if not os.path.exists(filepath):
+        return 0
+    with open(filepath, 'rb') as f:
+        return max(0, sum(1 for _ in f) - 1)
+
+
+def _link(src, dst):
+    # Enlace duro cuando se puede (las cachés nunca se modifican en el sitio, se reemplazan); si no, una copia
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def warm_caches(staging):
+    """Calcula las cachés Feather del archivo preparado, las mismas que leerá el dashboard.
+
+    Se parte de las cachés publicadas: como el archivo preparado es el CSV publicado con filas
+    añadidas al final, solo se limpian esas filas y se recalculan las particiones que tocan.
+    Devuelve pares (caché preparada, nombre de la caché publicada). Las cachés guardan la fecha de
+    modificación y el tamaño del CSV, que `os.replace` conserva, así que siguen siendo válidas tras
+    publicar el archivo.
+    """
+    if source_key(staging)['size'] >= STREAMING_MIN_BYTES:
+        df = load_annual_data(staging)
+        caches = [annual_cache_path]
+    else:
+        df = load_and_clean_data(staging)
+        caches = [cache_path]
+
+    load_headline_metrics(staging, lambda: SplitDataSet.build_index(df))
+    caches.append(metrics_cache_path)
+    return [(ruta(staging), ruta) for ruta in caches]
+
+
+def refresh(filepath='DataSet.csv', **options):
+    """Descarga los datos nuevos en el archivo de preparación y, si son válidos, los publica.
+
+    Las opciones se pasan a `WebScrapy.run`. Devuelve el número de filas nuevas publicadas (0 si
+    no había datos nuevos, en cuyo caso el CSV publicado no se toca). Si la descarga o la
+    validación fallan, el error se propaga y el CSV publicado queda intacto.
+    """
+    staging = staging_path(filepath)
+
+    # Se parte de una copia del CSV, del manifiesto y de las listas de la API para descargar solo lo que falta
+    if os.path.exists(filepath):
+        shutil.copyfile(filepath, staging)
+    elif os.path.exists(staging):
+        os.remove(staging)
+    for ruta in SCRAPER_FILES:
+        if os.path.exists(ruta(filepath)):
+            shutil.copyfile(ruta(filepath), ruta(staging))
+
+    try:
+        written = WebScrapy.run(staging, **options)
+        if written:
+            validate_dataset(staging, min_rows=count_rows(filepath))
+            for ruta in (cache_path, annual_cache_path, metrics_cache_path):
+                if os.path.exists(ruta(filepath)):
+                    _link(ruta(filepath), ruta(staging))
+            caches = warm_caches(staging)
+
+            # Primero las cachés y al final el CSV: hasta ese último reemplazo todos siguen leyendo la versión anterior
+            for staged, ruta in caches:
+                os.replace(staged, ruta(filepath))
+            os.replace(staging, filepath)
+        for ruta in SCRAPER_FILES:
+            if os.path.exists(ruta(staging)):
+                os.replace(ruta(staging), ruta(filepath))
+    finally:
+        temporales = [staging] + [ruta(staging) for ruta in SCRAPER_FILES + (cache_path, annual_cache_path, metrics_cache_path)]
+        for ruta in temporales:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    logger.info('🔄 Actualización de %s: %d filas nuevas', filepath, written)
+    return written
+
+
+class RefreshWorker:
+    """Hilo en segundo plano que ejecuta `refresh` cada `interval` segundos.
+
+    `on_swap(version)` se llama tras publicar una versión nueva del CSV, por ejemplo para
+    precalentar las cachés del dashboard. `status` guarda el resultado de la última ejecución.
+    """
+
+    def __init__(self, filepath='DataSet.csv', interval=REFRESH_INTERVAL, on_swap=None, **options):
+        self.filepath = filepath
+        self.interval = interval
+        self.on_swap = on_swap
+        self.options = dict({'verbose': False}, **options)
+        self.status = {'inicio': None, 'fin': None, 'filas': None, 'error': None}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='refresh-%s' % self.filepath, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def run_once(self):
+        """Ejecuta una actualización; los errores se registran en `status` sin detener el hilo."""
+        lock = open(lock_path(self.filepath), 'w')
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Otro proceso ya está actualizando este archivo
+                    return self.status
+
+            self.status = {'inicio': time.time(), 'fin': None, 'filas': None, 'error': None}
+            try:
+                self.status['filas'] = refresh(self.filepath, **self.options)
+            except Exception as error:
+                logger.exception('❌ Falló la actualización de %s', self.filepath)
+                self.status['error'] = repr(error)
+            self.status['fin'] = time.time()
+
+            if self.status['filas'] and self.on_swap is not None:
+                self.on_swap(tuple(source_key(self.filepath).values()))
+            return self.status
+        finally:
+            lock.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Actualiza el dataset en segundo plano y lo publica de forma atómica.')
+    parser.add_argument('--output', default='DataSet.csv', help='Archivo CSV publicado')
+    parser.add_argument('--interval', type=float, default=REFRESH_INTERVAL, help='Segundos entre actualizaciones')
+    parser.add_argument('--once', action='store_true', help='Ejecuta una sola actualización y termina')
+    parser.add_argument('--mode', choices=WebScrapy.FETCH_MODES, default='product', help='Modo de consulta del scraper')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    worker = RefreshWorker(args.output, args.interval, mode=args.mode)
+    if args.once:
+        status = worker.run_once()
+        raise SystemExit(1 if status['error'] else 0)
+    worker._loop()
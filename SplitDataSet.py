@@ -1,148 +1,274 @@
+import numpy as np
 import pandas as pd
 
+from Profiling import timed
+
+# Años que usan por defecto las vistas; el mes None indica el total anual (diciembre o el último mes publicado)
+ANIOS = [2020, 2021, 2022, 2023, 2024]
+MES_CIERRE = None
+
+# Producto de referencia y categorías que se expresan como porcentaje de la producción neta
+PRODUCTO_NETA = 'Producción neta de electricidad'
+CATEGORIAS_PRODUCCION_NETA = ['Consumo final', 'Pérdidas de distribución', 'Exportaciones totales']
+
+# Productos que resumen las métricas principales (KPIs) de cada país y año: columna del resultado -> producto
+PRODUCTOS_METRICAS = {
+    'PRODUCCION_NETA': 'Producción neta de electricidad',
+    'HIDROELECTRICA': 'Hidroeléctrica',
+    'SOLAR': 'Solar',
+    'EOLICA': 'Eólica',
+    'FOSILES': 'Combustibles fósiles',
+    'RENOVABLES': 'Renovables',
+    'ELECTRICIDAD_SUMINISTRADA': 'Electricidad suministrada',
+    'EXPORTACIONES': 'Exportaciones totales',
+}
+
+# Fuentes de generación que comparan las vistas de distribución y el gráfico radar
+FUENTES_ENERGIA = ['Hidroeléctrica', 'Solar', 'Renovables combustibles', 'Carbón', 'Petróleo', 'Gas natural', 'Otras renovables agregadas']
+
+
+class _GroupedTable:
+    """Posiciones de las filas de un DataFrame agrupadas por período y por país + período.
+
+    Cada grupo queda como un tramo [inicio, fin) de una única ordenación estable, y
+    PRODUCTO se guarda como códigos enteros para filtrar sin comparar cadenas.
+    """
+
+    def __init__(self, df, period_keys):
+        self.df = df
+        self._by_country = self._group_positions(df, ['PAIS'] + period_keys)
+        self._by_period = self._group_positions(df, period_keys)
+
+        productos = df['PRODUCTO'].astype('category')
+        self._product_codes = productos.cat.codes.to_numpy()
+        self._product_lookup = {label: code for code, label in enumerate(productos.cat.categories)}
+
+    @staticmethod
+    def _group_positions(df, keys):
+        grouper = df.groupby(keys, observed=True, sort=True)
+        ids = grouper.ngroup().to_numpy()
+        sizes = grouper.size()
+        order = np.argsort(ids, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(sizes.to_numpy())])
+        lookup = {key if isinstance(key, tuple) else (key,): group for group, key in enumerate(sizes.index)}
+        return lookup, order, bounds
+
+    @staticmethod
+    def _group(groups, key):
+        lookup, order, bounds = groups
+        group = lookup.get(key)
+        return None if group is None else order[bounds[group]:bounds[group + 1]]
+
+    def periods(self):
+        return list(self._by_period[0])
+
+    def positions(self, products, countries, periods):
+        """Posiciones (en el orden original) de las filas que cumplen el filtro."""
+        if countries is None:
+            groups = [self._group(self._by_period, period) for period in periods]
+        else:
+            groups = [self._group(self._by_country, (country,) + period) for country in countries for period in periods]
+        groups = [group for group in groups if group is not None]
+        if not groups:
+            return np.empty(0, dtype=np.intp)
+
+        positions = np.concatenate(groups)
+        codes = [self._product_lookup[product] for product in products if product in self._product_lookup]
+        positions = positions[np.isin(self._product_codes[positions], codes)]
+        return np.sort(positions)
+
+    def select(self, products, countries, periods):
+        return self.df.take(self.positions(products, countries, periods))
+
+
+class DataSetIndex:
+    """Índice de consultas sobre el DataFrame limpio, construido una sola vez por dataset.
+
+    Las consultas anuales se sirven desde el cubo anual: una fila por país, año y producto
+    con el acumulado del último mes publicado de ese país y año (diciembre si ya existe).
+    Las consultas de un mes concreto usan un índice mensual que se construye al primer uso.
+    """
+
+    def __init__(self, df):
+        self.df = df
+
+        # Cubo anual en una sola pasada: se conservan las filas del último mes de cada (PAIS, ANIO)
+        ultimo_mes = df.groupby(['PAIS', 'ANIO'], observed=True)['MES'].transform('max')
+        self.annual = df[df['MES'] == ultimo_mes]
+        self._annual = _GroupedTable(self.annual, ['ANIO'])
+        self._monthly = None
+
+        self.years = sorted(int(year) for (year,) in self._annual.periods())
+
+    def select(self, products, countries=None, years=ANIOS, month=MES_CIERRE):
+        """Filas que cumplen el filtro, con las etiquetas de índice del DataFrame original."""
+        years = self.years if years is None else years
+        if month is None:
+            return self._annual.select(products, countries, [(year,) for year in years])
+
+        if self._monthly is None:
+            self._monthly = _GroupedTable(self.df, ['ANIO', 'MES'])
+        return self._monthly.select(products, countries, [(year, month) for year in years])
+
+
 class SplitDataSet:
-    
+
+    # Método para construir una vez el índice de consultas que comparten todas las vistas; un índice ya
+    # construido o cualquier otro almacén con la misma interfaz (por ejemplo DataStore.SQLiteStore) se usa tal cual
+    @staticmethod
+    def build_index(df):
+        if not isinstance(df, pd.DataFrame):
+            return df
+        with timed('SplitDataSet.build_index') as stage:
+            stage.rows_in = len(df)
+            return DataSetIndex(df)
+
+
+    # Método para obtener el cubo anual (país × año × producto) que sirve a todas las vistas
+    @staticmethod
+    def get_annual_cube(df):
+        return SplitDataSet.build_index(df).annual
+
+
+    # Método común de filtrado: acepta el DataFrame limpio, un índice ya construido o un almacén SQLite
+    @staticmethod
+    def select(df, products, countries=None, years=ANIOS, month=MES_CIERRE):
+        return SplitDataSet.build_index(df).select(products, countries, years, month)
+
+
     # Método para obtener los datos comerciales de Colombia (importaciones, exportaciones, producción y consumo) de los años 2020 a 2024
     @staticmethod
-    def get_colombia_trade_data(df):
+    @timed('SplitDataSet.get_colombia_trade_data')
+    def get_colombia_trade_data(df, years=ANIOS, month=MES_CIERRE):
         # Filtramos los datos para Colombia, en el mes de diciembre, para los años entre 2020 y 2024 y con los productos de interés
-        return df[
-            (df['PAIS'] == 'Colombia') &  # Solo Colombia
-            (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &  # Años entre 2020 y 2024
-            (df['MES'] == 12) &  # Solo diciembre
-            (df['PRODUCTO'].isin([  # Filtramos los productos relacionados con comercio y producción/consumo
+        return SplitDataSet.select(
+            df,
+            [  # Filtramos los productos relacionados con comercio y producción/consumo
                 'Exportaciones totales',
                 'Importaciones totales',
                 'Producción neta de electricidad',
                 'Consumo final'
-            ]))
-        ]
+            ],
+            countries=['Colombia'],  # Solo Colombia
+            years=years,  # Años entre 2020 y 2024
+            month=month  # Solo diciembre
+        )
 
 
     # Método para calcular el cantidad de energía renovable por país y año
     @staticmethod
-    def get_renewable_percentage(df):
-         return df[
-                    (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &  # Años entre 2020 y 2024
-                    (df['MES'] == 12) &  # Solo diciembre
-                    (df['PRODUCTO'].isin(['Renovables']))  # Productos de interés
-                ]
+    @timed('SplitDataSet.get_renewable_percentage')
+    def get_renewable_percentage(df, years=ANIOS, month=MES_CIERRE):
+        return SplitDataSet.select(df, ['Renovables'], years=years, month=month)
 
 
     # Método para calcular el cantidad de energía no renovable por país y año
     @staticmethod
-    def get_non_renewable_percentage(df):
-        # Lista de productos no renovables
-        return df[
-                    (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &  # Años entre 2020 y 2024
-                    (df['MES'] == 12) &  # Solo diciembre
-                    (df['PRODUCTO'].isin(['No renovables']))  # Productos de interés
-                ]
+    @timed('SplitDataSet.get_non_renewable_percentage')
+    def get_non_renewable_percentage(df, years=ANIOS, month=MES_CIERRE):
+        return SplitDataSet.select(df, ['No renovables'], years=years, month=month)
 
 
     # Método para obtener los datos de producción y exportación de energía de Colombia
     @staticmethod
-    def get_colombia_energy_export_data(df):
+    @timed('SplitDataSet.get_colombia_energy_export_data')
+    def get_colombia_energy_export_data(df, years=ANIOS, month=MES_CIERRE):
         # Filtramos los datos para Colombia (años 2020-2024) y los productos de interés (producción y exportaciones)
-        return df[
-            (df['PAIS'] == 'Colombia') &  # Solo Colombia
-            (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &  # Años entre 2020 y 2024
-            (df['MES'] == 12) &  # Solo diciembre
-            (df['PRODUCTO'].isin(['Producción neta de electricidad', 'Exportaciones totales']))  # Productos de interés
-        ]
-
-
-    # Método para obtener la distribución (en porcentaje) de consumo, pérdidas, exportaciones e importaciones 
-    # sobre la producción neta de electricidad en Colombia para diciembre de 2024
-    @staticmethod
-    def get_distribution_over_net_production_colombia(df):
-        # Productos clave
-        productos_interes = [
-            'Producción neta de electricidad',
-            'Consumo final',
-            'Pérdidas de distribución',
-            'Exportaciones totales'
-        ]
-
-        # Filtrar Colombia, diciembre y productos relevantes
-        df_filtrado = df[
-            (df['PAIS'] == 'Colombia') &
-            (df['MES'] == 12) &
-            (df['PRODUCTO'].isin(productos_interes))
-        ][['ANIO', 'PRODUCTO', 'ELECTRICIDAD_GENERADA_ACUMULADA']].copy()
-
-        # Pivotear para tener cada producto como columna
-        df_pivot = df_filtrado.pivot(index='ANIO', columns='PRODUCTO', values='ELECTRICIDAD_GENERADA_ACUMULADA').reset_index()
-
-        # Calcular los porcentajes respecto a Producción neta
-        df_pivot['% Consumo'] = (df_pivot['Consumo final'] / df_pivot['Producción neta de electricidad']) * 100
-        df_pivot['% Pérdidas'] = (df_pivot['Pérdidas de distribución'] / df_pivot['Producción neta de electricidad']) * 100
-        df_pivot['% Exportaciones'] = (df_pivot['Exportaciones totales'] / df_pivot['Producción neta de electricidad']) * 100
-
-        # Unir resultados en formato largo
-        df_resultado = pd.melt(
-            df_pivot,
-            id_vars='ANIO',
-            value_vars=['Consumo final', 'Pérdidas de distribución', 'Exportaciones totales'],
-            var_name='Categoría Energética',
-            value_name='Electricidad (GWh)'
+        return SplitDataSet.select(
+            df,
+            ['Producción neta de electricidad', 'Exportaciones totales'],  # Productos de interés
+            countries=['Colombia'],
+            years=years,
+            month=month
         )
 
-        df_resultado['% sobre Producción Neta'] = pd.melt(
-            df_pivot,
-            id_vars='ANIO',
-            value_vars=['% Consumo', '% Pérdidas', '% Exportaciones']
-        )['value']
 
-        # Renombrar para visualización
-        df_resultado = df_resultado.rename(columns={'ANIO': 'año'})
+    # Método para obtener, para varios países a la vez, la distribución de consumo, pérdidas y exportaciones
+    # sobre la producción neta de electricidad, en formato largo y sin pivotear
+    @staticmethod
+    @timed('SplitDataSet.get_distribution_over_net_production')
+    def get_distribution_over_net_production(df, countries=None, years=None, month=MES_CIERRE):
+        df_filtrado = SplitDataSet.select(
+            df, [PRODUCTO_NETA] + CATEGORIAS_PRODUCCION_NETA, countries=countries, years=years, month=month
+        )[['PAIS', 'ANIO', 'PRODUCTO', 'ELECTRICIDAD_GENERADA_ACUMULADA']]
 
-        return df_resultado
+        # Una fila por país, año y producto (si hay duplicados se queda la última publicada)
+        df_filtrado = df_filtrado.drop_duplicates(['PAIS', 'ANIO', 'PRODUCTO'], keep='last')
+        valores = df_filtrado.set_index(['PAIS', 'ANIO', 'PRODUCTO'])['ELECTRICIDAD_GENERADA_ACUMULADA']
+
+        # Rejilla completa categoría × (país, año): los productos que falten en un año quedan como NaN
+        periodos = df_filtrado[['PAIS', 'ANIO']].drop_duplicates().sort_values(['PAIS', 'ANIO'])
+        n = len(periodos)
+        pais = np.tile(periodos['PAIS'].to_numpy(), len(CATEGORIAS_PRODUCCION_NETA))
+        anio = np.tile(periodos['ANIO'].to_numpy(), len(CATEGORIAS_PRODUCCION_NETA))
+        categoria = np.repeat(CATEGORIAS_PRODUCCION_NETA, n)
+
+        electricidad = valores.reindex(pd.MultiIndex.from_arrays([pais, anio, categoria])).to_numpy()
+        neta = valores.reindex(pd.MultiIndex.from_arrays([pais, anio, np.repeat(PRODUCTO_NETA, len(pais))])).to_numpy()
+
+        return pd.DataFrame({
+            'PAIS': pais,
+            'año': anio,
+            'Categoría Energética': pd.array(categoria, dtype='str'),
+            'Electricidad (GWh)': electricidad,
+            '% sobre Producción Neta': electricidad / neta * 100,
+        })
+
+
+    # Método para obtener la distribución (en porcentaje) de consumo, pérdidas y exportaciones
+    # sobre la producción neta de electricidad de un país (por defecto Colombia)
+    @staticmethod
+    @timed('SplitDataSet.get_distribution_over_net_production_colombia')
+    def get_distribution_over_net_production_colombia(df, years=None, month=MES_CIERRE, country='Colombia'):
+        return SplitDataSet.get_distribution_over_net_production(
+            df, countries=[country], years=years, month=month
+        ).drop(columns='PAIS')
 
 
     # Método para obtener los datos de energía renovable y no renovable de Colombia
     @staticmethod
-    def get_renewable_and_nonrenewable_data(df):
-        return df[
-            (df['PAIS'] == 'Colombia') &  # Solo Colombia
-            (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &  # Años entre 2020 y 2024
-            (df['MES'] == 12) &  # Solo diciembre
-            (df['PRODUCTO'].isin(['Renovables', 'No renovables']))  # Solo productos renovables y no renovables
-        ]
-    
+    @timed('SplitDataSet.get_renewable_and_nonrenewable_data')
+    def get_renewable_and_nonrenewable_data(df, years=ANIOS, month=MES_CIERRE):
+        return SplitDataSet.select(
+            df,
+            ['Renovables', 'No renovables'],  # Solo productos renovables y no renovables
+            countries=['Colombia'],  # Solo Colombia
+            years=years,
+            month=month
+        )
+
     # Método para obtener la distribución de las fuentes de energía (hidroeléctrica, solar, etc.) en Colombia en un año específico
     @staticmethod
-    def get_energy_source_distribution(df, year=2024, country='Colombia'):
+    @timed('SplitDataSet.get_energy_source_distribution')
+    def get_energy_source_distribution(df, year=2024, country='Colombia', month=MES_CIERRE):
         # Filtramos los datos para el país y año especificados, solo para diciembre y con los productos de interés
-        df_filtered = df[
-            (df['PAIS'] == country) &  # País específico (por defecto Colombia)
-            (df['ANIO'] == year) &  # Año específico (por defecto 2024)
-            (df['MES'] == 12) &  # Solo diciembre
-            (df['PRODUCTO'].isin(['Hidroeléctrica', 'Solar', 'Renovables combustibles', 'Carbón', 'Petróleo', 'Gas natural', 'Otras renovables agregadas']))  # Productos de interés
-        ]
-        
+        df_filtered = SplitDataSet.select(
+            df,
+            FUENTES_ENERGIA,  # Productos de interés
+            countries=[country],  # País específico (por defecto Colombia)
+            years=[year],  # Año específico (por defecto 2024)
+            month=month
+        )
+
         # Calculamos el total de electricidad generada en esas categorías
         total = df_filtered['ELECTRICIDAD_GENERADA_ACUMULADA'].sum()
-        
+
         # Calculamos el porcentaje que representa cada fuente de energía respecto al total
         df_filtered['Porcentaje'] = (df_filtered['ELECTRICIDAD_GENERADA_ACUMULADA'] / total) * 100
-        
+
         return df_filtered
-    
+
     # Método para obtener la distribución de las fuentes de energía (hidroeléctrica, solar, etc.) en Colombia en un año específico
     @staticmethod
-    def get_energy_source_distribution_american(df, year=2024, country=None):
-        df_filtered = df[
-            (df['ANIO'].isin([2020, 2021, 2022, 2023, 2024])) &
-            (df['MES'] == 12) &
-            (df['PRODUCTO'].isin([
-                'Hidroeléctrica', 'Solar', 'Renovables combustibles', 
-                'Carbón', 'Petróleo', 'Gas natural', 'Otras renovables agregadas'
-            ]))
-        ]
-
-        if country is not None:
-            df_filtered = df_filtered[df_filtered['PAIS'] == country]
+    @timed('SplitDataSet.get_energy_source_distribution_american')
+    def get_energy_source_distribution_american(df, year=2024, country=None, years=ANIOS, month=MES_CIERRE):
+        df_filtered = SplitDataSet.select(
+            df,
+            FUENTES_ENERGIA,
+            countries=None if country is None else [country],
+            years=years,
+            month=month
+        )
 
         total = df_filtered['ELECTRICIDAD_GENERADA_ACUMULADA'].sum()
         df_filtered = df_filtered.copy()
@@ -150,3 +276,128 @@ class SplitDataSet:
 
         return df_filtered
 
+    # Método para obtener en una sola pasada la matriz país × fuente con el porcentaje de cada fuente en un año
+    @staticmethod
+    @timed('SplitDataSet.get_energy_source_matrix')
+    def get_energy_source_matrix(df, year=2024, countries=None, month=MES_CIERRE):
+        df_filtered = SplitDataSet.select(
+            df,
+            FUENTES_ENERGIA,
+            countries=countries,
+            years=[year],
+            month=month
+        )
+
+        # Una fila por país y una columna por fuente; las fuentes sin datos cuentan como 0
+        matriz = df_filtered.pivot_table(
+            index='PAIS', columns='PRODUCTO', values='ELECTRICIDAD_GENERADA_ACUMULADA',
+            aggfunc='sum', observed=True
+        )
+        matriz = matriz.reindex(
+            index=matriz.index if countries is None else countries, columns=FUENTES_ENERGIA
+        ).fillna(0)
+        matriz.index = list(matriz.index)
+        matriz.columns = list(matriz.columns)
+
+        # Porcentaje de cada fuente respecto al total de las fuentes del país
+        return (matriz.div(matriz.sum(axis=1), axis=0) * 100).fillna(0)
+
+    # Método para obtener las series mensuales por país y producto con el acumulado de 12 meses, la variación
+    # interanual y la cuota renovable, calculadas con operaciones vectorizadas sobre el orden (PAIS, PRODUCTO, ANIO, MES)
+    @staticmethod
+    @timed('SplitDataSet.get_monthly_series')
+    def get_monthly_series(df, countries=None, products=None):
+        df = df if isinstance(df, pd.DataFrame) else df.df
+        if countries is not None:
+            df = df[df['PAIS'].isin(countries)]
+
+        data = df[['PAIS', 'PRODUCTO', 'ANIO', 'MES', 'ELECTRICIDAD_GENERADA_GWH']]
+        pais = data['PAIS'].astype('category').cat.codes.to_numpy().astype(np.int64)
+        producto = data['PRODUCTO'].astype('category').cat.codes.to_numpy().astype(np.int64)
+        periodo = data['ANIO'].to_numpy().astype(np.int64) * 12 + data['MES'].to_numpy() - 1
+
+        # Orden (PAIS, PRODUCTO, período) y una clave entera creciente: cada serie ocupa un rango propio de claves,
+        # separado del siguiente por más de 12 períodos, así que buscar "12 meses antes" nunca cruza de serie
+        orden = np.lexsort((periodo, producto, pais))
+        data = data.iloc[orden].reset_index(drop=True)
+        periodo = periodo[orden]
+        cambio = np.ones(len(data), dtype=bool)
+        cambio[1:] = (np.diff(pais[orden]) != 0) | (np.diff(producto[orden]) != 0)
+        clave = np.cumsum(cambio) * (periodo.max(initial=0) + 13) + periodo
+
+        valor = data['ELECTRICIDAD_GENERADA_GWH'].to_numpy(dtype=np.float64)
+        acumulado = np.r_[0.0, np.cumsum(valor)]
+        posicion = np.arange(len(data))
+
+        # Acumulado de 12 meses: suma de las filas con período en (p - 12, p]; solo si están los 12 meses
+        inicio = np.searchsorted(clave, clave - 11, side='left')
+        suma_12 = acumulado[posicion + 1] - acumulado[inicio]
+        data['ACUMULADO_12_MESES'] = np.where(posicion - inicio + 1 == 12, suma_12, np.nan)
+
+        # Variación interanual: diferencia con el mismo mes del año anterior, si existe
+        anterior = np.searchsorted(clave, clave - 12, side='left')
+        anterior = np.minimum(anterior, len(data) - 1)
+        existe = clave[anterior] == clave - 12
+        valor_anterior = np.where(existe, valor[anterior], np.nan)
+        data['VARIACION_ANUAL'] = valor - valor_anterior
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data['VARIACION_ANUAL_PCT'] = (valor - valor_anterior) / np.abs(valor_anterior) * 100
+
+        # Cuota renovable del país en cada mes: Renovables / Producción neta, unida por (PAIS, ANIO, MES)
+        claves = ['PAIS', 'ANIO', 'MES']
+        renovables = data.loc[data['PRODUCTO'] == 'Renovables', claves + ['ELECTRICIDAD_GENERADA_GWH']]
+        neta = data.loc[data['PRODUCTO'] == 'Producción neta de electricidad', claves + ['ELECTRICIDAD_GENERADA_GWH']]
+        cuota = renovables.merge(neta, on=claves, suffixes=('_REN', '_NETA'))
+        cuota['CUOTA_RENOVABLE'] = cuota['ELECTRICIDAD_GENERADA_GWH_REN'] / cuota['ELECTRICIDAD_GENERADA_GWH_NETA'] * 100
+        data = data.merge(cuota[claves + ['CUOTA_RENOVABLE']], on=claves, how='left')
+
+        if products is not None:
+            data = data[data['PRODUCTO'].isin(products)].reset_index(drop=True)
+        return data
+
+    # Método para calcular en una sola pasada las métricas principales de cada país y año: participación de cada
+    # fuente sobre la producción neta, consumo (electricidad suministrada) con su posición en el año y crecimiento
+    # de las exportaciones respecto al año anterior. Con `previous` y `partitions` solo se recalculan los valores de
+    # las particiones (país, año) indicadas y el resto se toma de `previous`
+    @staticmethod
+    @timed('SplitDataSet.get_headline_metrics')
+    def get_headline_metrics(df, previous=None, partitions=None):
+        if previous is None or partitions is None:
+            metricas = SplitDataSet._headline_values(df)
+        else:
+            conservadas = ~pd.MultiIndex.from_frame(previous[['PAIS', 'ANIO']]).isin(list(partitions))
+            columnas = ['PAIS', 'ANIO', 'MES'] + list(PRODUCTOS_METRICAS)
+            metricas = pd.concat([previous.loc[conservadas, columnas], SplitDataSet._headline_values(df, partitions)], ignore_index=True)
+        metricas = metricas.sort_values(['PAIS', 'ANIO'], ignore_index=True)
+
+        for fuente in ['HIDROELECTRICA', 'SOLAR', 'EOLICA', 'FOSILES', 'RENOVABLES']:
+            metricas['CUOTA_' + fuente] = metricas[fuente] / metricas['PRODUCCION_NETA'] * 100
+
+        metricas['POSICION_CONSUMO'] = metricas.groupby('ANIO')['ELECTRICIDAD_SUMINISTRADA'].rank(ascending=False, method='min')
+
+        # Crecimiento de exportaciones: solo entre dos años consecutivos y cerrados del mismo país
+        anterior = metricas.groupby('PAIS')[['ANIO', 'MES', 'EXPORTACIONES']].shift()
+        comparable = (metricas['ANIO'] - anterior['ANIO'] == 1) & (metricas['MES'] == 12) & (anterior['MES'] == 12)
+        crecimiento = (metricas['EXPORTACIONES'] / anterior['EXPORTACIONES'] - 1) * 100
+        metricas['CRECIMIENTO_EXPORTACIONES'] = crecimiento.where(comparable)
+
+        return metricas
+
+    @staticmethod
+    def _headline_values(df, partitions=None):
+        """Valor de cada producto de PRODUCTOS_METRICAS por (PAIS, ANIO), opcionalmente solo de las particiones indicadas."""
+        if partitions is None:
+            cubo = SplitDataSet.select(df, list(PRODUCTOS_METRICAS.values()), years=None)
+        else:
+            paises, anios = sorted({pais for pais, _ in partitions}), sorted({anio for _, anio in partitions})
+            cubo = SplitDataSet.select(df, list(PRODUCTOS_METRICAS.values()), countries=paises, years=anios)
+            cubo = cubo[pd.MultiIndex.from_arrays([cubo['PAIS'].astype(str), cubo['ANIO']]).isin(list(partitions))]
+        cubo = cubo.drop_duplicates(['PAIS', 'ANIO', 'PRODUCTO'], keep='last')
+
+        # Una columna por producto y una fila por (PAIS, ANIO); MES indica si el año está cerrado (12)
+        valores = cubo.set_index(['PAIS', 'ANIO', 'MES', 'PRODUCTO'])['ELECTRICIDAD_GENERADA_ACUMULADA'].unstack('PRODUCTO')
+        valores = valores.reindex(columns=list(PRODUCTOS_METRICAS.values()))
+        valores.columns = list(PRODUCTOS_METRICAS)
+        valores = valores.reset_index()
+        valores['PAIS'] = valores['PAIS'].astype(str)
+        return valores
@@ -0,0 +1,135 @@
+"""
+Validación de calidad del dataset, entre la lectura del CSV y el cálculo de porcentajes y vistas.
+
+Las reglas se evalúan sobre el DataFrame con las columnas ya limpias (categorías traducidas) y son
+operaciones vectorizadas sobre columnas completas, sin recorrer filas en Python:
+
+- claves (país, año, mes, producto) duplicadas, que aparecen si el CSV recibe dos veces una fila;
+- acumulado del año que disminuye de un mes al siguiente en un producto sin valores negativos;
+- meses en los que la suma de los productos que componen la producción neta no coincide con ella.
+
+`validate` devuelve un informe compacto (filas o periodos afectados y algunos ejemplos por regla)
+y las filas que incumplen las reglas por fila, que `rows_to_drop` convierte en las filas a descartar.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Acciones: sin validar, solo informar, quitar copias anteriores de claves duplicadas o apartar toda fila inválida
+VALIDATION_ACTIONS = ('off', 'report', 'dedupe', 'quarantine')
+
+PRODUCTO_NETA = 'Producción neta de electricidad'
+
+# Descomposiciones de la producción neta: la suma mensual de cada grupo debe coincidir con ella
+COMPONENTES_PRODUCCION_NETA = {
+    'renovables': ['Renovables', 'No renovables'],
+    'fuentes': ['Total combustibles', 'Nuclear', 'Hidroeléctrica', 'Eólica', 'Solar', 'Geotérmica',
+                'Otras renovables', 'No especificado'],
+}
+
+# Diferencia relativa admitida entre la suma de los componentes y la producción neta
+TOLERANCIA = 0.01
+
+# Ejemplos que se guardan en el informe por cada regla
+EJEMPLOS = 5
+
+
+def _lookup(serie, labels):
+    # Tabla indexada por código de categoría: True en las etiquetas indicadas (evita np.isin sobre todas las filas)
+    categories = serie.cat.categories
+    table = np.zeros(len(categories) + 1, dtype=bool)
+    table[[categories.get_loc(label) for label in labels if label in categories]] = True
+    return table
+
+
+def _examples(df, mask):
+    rows = df.loc[mask, ['PAIS', 'ANIO', 'MES', 'PRODUCTO']].head(EJEMPLOS)
+    return [(str(pais), int(anio), int(mes), str(producto)) for pais, anio, mes, producto in rows.itertuples(index=False)]
+
+
+def validate(df, tolerance=TOLERANCIA):
+    """Evalúa las reglas de calidad sobre un DataFrame con las columnas de CleanData.clean_columns.
+
+    Devuelve (informe, filas): el informe es un diccionario por regla con el número de filas o
+    periodos afectados y hasta EJEMPLOS claves de ejemplo; `filas` tiene una máscara booleana por
+    cada regla por fila ('duplicados': copias anteriores de una clave repetida, que se descartan
+    conservando la última como hacen las vistas; 'acumulado_decreciente').
+    """
+    pais = df['PAIS'].cat.codes.to_numpy().astype(np.int64)
+    producto = df['PRODUCTO'].cat.codes.to_numpy().astype(np.int64)
+    anio = df['ANIO'].to_numpy().astype(np.int64)
+    mes = df['MES'].to_numpy().astype(np.int64)
+    valor = df['ELECTRICIDAD_GENERADA_GWH'].to_numpy()
+    acumulado = df['ELECTRICIDAD_GENERADA_ACUMULADA'].to_numpy()
+
+    # Claves enteras: periodo (país, año, mes), serie (país, año, producto) y fila (periodo, producto)
+    periodo = (pais * 65536 + anio) * 16 + mes
+    serie = (pais * 65536 + anio) * 4096 + producto
+    clave = periodo * 4096 + producto
+
+    duplicados = pd.Series(clave).duplicated(keep='last').to_numpy()
+    conservadas = np.flatnonzero(~duplicados)
+
+    # Acumulado decreciente: filas de cada serie ordenadas por mes y comparadas con el mes anterior
+    orden = conservadas[np.argsort(serie[conservadas] * 16 + mes[conservadas], kind='stable')]
+    misma_serie = serie[orden][1:] == serie[orden][:-1]
+    baja = misma_serie & (acumulado[orden][1:] < acumulado[orden][:-1]) & (valor[orden][1:] >= 0)
+    decreciente = np.zeros(len(df), dtype=bool)
+    decreciente[orden[1:][baja]] = True
+
+    informe = {
+        'filas': len(df),
+        'duplicados': {'filas': int(duplicados.sum()), 'ejemplos': _examples(df, duplicados)},
+        'acumulado_decreciente': {'filas': int(decreciente.sum()), 'ejemplos': _examples(df, decreciente)},
+    }
+
+    # Suma de componentes frente a la producción neta, por periodo; el código -1 (nulo) cae en la última posición de la tabla
+    filas_neta = conservadas[_lookup(df['PRODUCTO'], [PRODUCTO_NETA])[producto[conservadas]]]
+    neta = pd.Series(valor[filas_neta], index=periodo[filas_neta])
+    for nombre, componentes in COMPONENTES_PRODUCCION_NETA.items():
+        filas = conservadas[_lookup(df['PRODUCTO'], componentes)[producto[conservadas]]]
+        suma = pd.Series(valor[filas]).groupby(periodo[filas], sort=False).sum().reindex(neta.index)
+        distinta = ((suma - neta).abs() > tolerance * neta.abs() + 1e-9).to_numpy()
+        malos = np.zeros(len(df), dtype=bool)
+        malos[filas_neta[distinta]] = True
+        informe['suma_' + nombre] = {'periodos': int(malos.sum()), 'ejemplos': [key[:3] for key in _examples(df, malos)]}
+
+    return informe, {'duplicados': duplicados, 'acumulado_decreciente': decreciente}
+
+
+def rows_to_drop(filas, action):
+    """Máscara de filas que descarta una acción: las copias duplicadas con 'dedupe' y además los acumulados decrecientes con 'quarantine'."""
+    if action == 'dedupe':
+        return filas['duplicados']
+    if action == 'quarantine':
+        return filas['duplicados'] | filas['acumulado_decreciente']
+    return None
+
+
+def summary(informe):
+    """Resumen de una línea del informe de validación."""
+    partes = ['%d claves duplicadas' % informe['duplicados']['filas'],
+              '%d acumulados decrecientes' % informe['acumulado_decreciente']['filas']]
+    partes += ['%d periodos con suma de %s distinta de la producción neta' % (informe['suma_' + nombre]['periodos'], nombre)
+               for nombre in COMPONENTES_PRODUCCION_NETA]
+    return ', '.join(partes)
+
+
+def has_violations(informe):
+    """Indica si alguna regla del informe tiene filas o periodos afectados."""
+    return any(regla.get('filas', regla.get('periodos', 0)) for nombre, regla in informe.items() if nombre != 'filas')
+
+
+def merge(informes):
+    """Une los informes de varios bloques del mismo archivo sumando los conteos; None si no se validó."""
+    informes = [informe for informe in informes if informe is not None]
+    if not informes:
+        return None
+    total = {'filas': sum(informe['filas'] for informe in informes)}
+    for nombre, regla in informes[0].items():
+        if nombre == 'filas':
+            continue
+        conteo = 'filas' if 'filas' in regla else 'periodos'
+        ejemplos = [ejemplo for informe in informes for ejemplo in informe[nombre]['ejemplos']]
+        total[nombre] = {conteo: sum(informe[nombre][conteo] for informe in informes), 'ejemplos': ejemplos[:EJEMPLOS]}
+    return total
@@ -1,24 +1,53 @@
 # Import necessary libraries
 import os          # Para manejo de archivos (verificar existencia, tamaño, etc.)
 import csv         # Para leer y escribir archivos CSV
-import requests    # Para hacer peticiones HTTP (usando la API)
+import json        # Para guardar el manifiesto de progreso
+import time        # Para medir esperas entre reintentos y controlar la tasa de solicitudes
+import random      # Para añadir variación (jitter) a las esperas entre reintentos
+import argparse    # Para configurar la ejecución desde la línea de comandos
+import logging     # Para avisar de las respuestas anuales incompletas
+import threading   # Para sincronizar el limitador de tasa entre hilos
+from concurrent.futures import ThreadPoolExecutor  # Para lanzar solicitudes en paralelo
 from pprint import pprint  # Para imprimir resultados en consola de forma legible
 
+logger = logging.getLogger(__name__)
 
 # Establece la bandera VERBOSE en True para imprimir información sobre cada solicitud a la API
 VERBOSE = True
 
+# URL base de la API (se puede sobrescribir, por ejemplo, para apuntar a un servidor local de pruebas)
+API_BASE = os.environ.get('IEA_API_BASE', 'https://api.iea.org')
+
 # Define los endpoints de la API para obtener los años, productos y países disponibles
-api_list_template = 'https://api.iea.org/mes/list/%s'
+api_list_template = '/mes/list/%s'
 
 # Define el endpoint de la API para obtener datos mensuales de un país, año, mes y producto específicos
-api_information_template = 'https://api.iea.org/mes/latest/month?COUNTRY=%s&YEAR=%s&MONTH=%s&PRODUCT=%s&share=true'
+api_information_template = '/mes/latest/month?COUNTRY=%s&YEAR=%s&MONTH=%s&PRODUCT=%s&share=true'
+
+# Endpoint para pedir de una vez todo un año de un país (todos los meses y productos publicados)
+api_slice_template = '/mes/latest/month?COUNTRY=%s&YEAR=%s&share=true'
+
+# Modos de consulta: una solicitud por producto y mes, o una sola por país y año
+FETCH_MODES = ('product', 'year')
+
+# Parámetros de concurrencia, reintentos y límite de solicitudes por segundo
+MAX_WORKERS = 8
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5        # Segundos de espera antes del primer reintento (se duplica en cada intento)
+REQUESTS_PER_SECOND = 10  # 0 o None desactiva el límite
+TIMEOUT = 30
+
+# Cada cuántas respuestas se guarda el manifiesto de progreso
+CHECKPOINT_EVERY = 200
 
-# Obtiene las listas de años, productos y países disponibles desde la API
-years = requests.get(api_list_template % 'YEAR').json()
-years = [int(y) for y in years if int(y) >= 2020]  # Filtrar años desde 2020 en adelante
-products = requests.get(api_list_template % 'PRODUCT').json()
-countries = requests.get(api_list_template % 'COUNTRY').json()
+# Segundos durante los que se reutilizan las listas de años, productos y países guardadas en disco (0 = no guardarlas)
+LISTS_TTL = 24 * 60 * 60
+
+# Producto de referencia usado para saber si un mes ya fue publicado
+PROBE_PRODUCT = 'Net electricity production'
+
+# Códigos HTTP que se consideran transitorios y justifican un reintento
+RETRY_STATUS = {429, 500, 502, 503, 504}
 
 # Lista de países de América para filtrar
 paises_america = ['Argentina', 'Brazil', 'Canada', 'Chile', 'Colombia', 'Costa Rica', 'Mexico', 'United States']
@@ -33,60 +62,445 @@ header = [
     'yearToDate',         # Cantidad de electricidad generada en el año actual hasta el mes actual en GWh
 ]
 
-# Si el archivo CSV está vacío
-index_last_year, index_last_month, index_last_country, index_last_product = 0, 1, 0, 0
 
-# Abre el archivo CSV para escritura
-with open('DataSet.csv', 'a+', newline='') as csv_file:
-    writer = csv.DictWriter(csv_file, fieldnames=header)
+class RateLimiter:
+    """Limita el número de solicitudes por segundo compartido entre todos los hilos."""
+
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+
+        # Cada llamada reserva el siguiente turno libre y duerme fuera del lock hasta que llegue
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def create_session(max_workers=MAX_WORKERS):
+    """Crea una sesión HTTP compartida con un pool de conexiones del tamaño de la concurrencia."""
+    # requests se importa al crear la sesión: importar este módulo no carga el cliente HTTP
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_json(session, url, limiter=None, max_retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+    """Descarga una URL y devuelve su JSON, o None si la API responde que no hay datos (404).
+
+    Los errores de red y los códigos transitorios (429, 5xx) se reintentan con espera
+    exponencial; si se agotan los reintentos se propaga el último error. Cualquier otra
+    respuesta no exitosa (400, 401, 403, 410...) lanza HTTPError: un bloqueo temporal o un fallo
+    de autenticación no debe quedar guardado en el manifiesto como "publicado sin datos".
+    """
+    import requests
+
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.wait()
+
+        try:
+            response = session.get(url, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+            continue
+
+        if response.status_code in RETRY_STATUS and attempt < max_retries:
+            # Respeta la cabecera Retry-After si el servidor la envía
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt * (1 + random.random())
+            time.sleep(delay)
+            continue
+
+        # Solo un 404 significa que no hay datos para esa combinación; los demás errores se propagan
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+
+def lists_cache_path(filepath):
+    """Ruta de la copia en disco de las listas de la API asociada a un archivo CSV."""
+    return filepath + '.lists.json'
+
+
+def load_lists(path, api_base=API_BASE, ttl=LISTS_TTL):
+    """Lee las listas guardadas si son de la misma API y tienen menos de `ttl` segundos, o None."""
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('api_base') != api_base or time.time() - cached.get('updated', 0) > ttl:
+        return None
+    return cached['lists']
+
+
+def save_lists(path, lists, api_base=API_BASE):
+    """Guarda las listas de forma atómica (archivo temporal + reemplazo)."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'updated': time.time(), 'api_base': api_base, 'lists': lists}, f)
+    os.replace(tmp_path, path)
+
+
+def fetch_lists(session, limiter=None, api_base=API_BASE, cache=None, ttl=LISTS_TTL):
+    """Obtiene las listas de años (desde 2020), productos y países disponibles en la API.
+
+    Con `cache` las listas se guardan en ese archivo y se reutilizan durante `ttl` segundos
+    sin consultar la API.
+    """
+    lists = load_lists(cache, api_base, ttl) if cache and ttl else None
+    if lists is None:
+        lists = {name: fetch_json(session, api_base + api_list_template % name, limiter)
+                 for name in ('YEAR', 'PRODUCT', 'COUNTRY')}
+        if cache and ttl and all(values is not None for values in lists.values()):
+            save_lists(cache, lists, api_base)
+
+    years = [int(y) for y in lists['YEAR'] if int(y) >= 2020]  # Filtrar años desde 2020 en adelante
+    return years, lists['PRODUCT'], lists['COUNTRY']
+
+
+def select_countries(countries, paises=paises_america):
+    """Filtra la lista de países de la API dejando solo los de interés."""
+    # Comparamos con una copia legible del nombre del país (sin espacios ni apóstrofes)
+    return [country for country in countries if country.strip().replace("'", "") in paises]
+
+
+def build_tasks(years, products, countries, paises=paises_america, existing=None, empty=None):
+    """Genera las combinaciones (país, año, mes, producto) a consultar, en el mismo orden del recorrido original.
+
+    Se omiten las claves que ya están en el CSV (`existing`) y las que la API ya
+    respondió sin datos en un mes publicado (`empty`).
+    """
+    existing = existing or set()
+    empty = empty or set()
+
+    tasks = []
+    for year in years:
+        for month in range(1, 13):
+            for country in select_countries(countries, paises):
+                for product in products:
+                    key = (country, year, month, product)
+                    if key not in existing and key not in empty:
+                        tasks.append(key)
+    return tasks
+
+
+def parse_record(response):
+    """Convierte la respuesta de la API en una fila con las columnas de `header`."""
+    result = dict()
+
+    # Extrae los datos de la respuesta y los añade al diccionario, omitiendo 'CODE_TIME'
+    for key, value in response['latest'][0].items():
+        if key not in ['CODE_TIME', 'TIME', 'MONTH_NAME', 'DISPLAY_ORDER']:
+            result[key] = value
+
+    # Añade datos acumulados del año actual
+    result['yearToDate'] = response['yearToDate']
+    return result
+
+
+def parse_slice(response):
+    """Reparte la respuesta de un año completo en filas con las columnas de `header`.
+
+    Se usa el acumulado de cada registro cuando la API lo trae. Si no, `yearToDate` se calcula
+    localmente como la suma de VALUE de los meses hasta el actual, lo que solo es correcto si
+    la respuesta trae todos los meses anteriores del producto. Devuelve (filas, incompletas):
+    los (mes, producto) a partir del primer mes que falta de un producto no se devuelven como
+    filas, sino en `incompletas` junto con los meses que faltan, para pedirlos producto por
+    producto con el acumulado de la API.
+    """
+    rows, incomplete = [], []
+    accumulated, last_month, gaps = {}, {}, set()
+    for record in sorted(response['latest'], key=lambda r: int(r['MONTH'])):
+        result = {key: value for key, value in record.items()
+                  if key not in ['CODE_TIME', 'TIME', 'MONTH_NAME', 'DISPLAY_ORDER']}
+        product, month = result['PRODUCT'], int(result['MONTH'])
+        if 'yearToDate' not in result:
+            # Un hueco en los meses del producto invalida la suma desde ese mes hasta el final del año
+            if product in gaps or last_month.get(product, 0) != month - 1:
+                # Se piden también los meses que faltan, que la respuesta anual no trae para este producto
+                if product not in gaps:
+                    incomplete += [(missing, product) for missing in range(last_month.get(product, 0) + 1, month)]
+                gaps.add(product)
+                incomplete.append((month, product))
+                continue
+            last_month[product] = month
+            accumulated[product] = accumulated.get(product, 0) + result['VALUE']
+            result['yearToDate'] = accumulated[product]
+        rows.append(result)
+    return rows, incomplete
+
+
+def fetch_rows(tasks, session, limiter=None, max_workers=MAX_WORKERS, api_base=API_BASE):
+    """Descarga las tareas en paralelo y devuelve pares (tarea, fila) en el orden de `tasks`.
+
+    Las solicitudes comparten una misma sesión (y su pool de conexiones) y un mismo
+    limitador de tasa; la fila es None cuando la API no tiene datos para la tarea.
+    """
+    def fetch_one(task):
+        country, year, month, product = task
+
+        # Reemplaza apóstrofes en el nombre del país con %27 para crear una URL válida
+        url = api_base + api_information_template % (country.replace('\'', '%27'), year, month, product)
+        response = fetch_json(session, url, limiter)
+        if response is None or not response.get('latest'):
+            return task, None
+        return task, parse_record(response)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(fetch_one, tasks)
+
+
+def fetch_slices(tasks, session, limiter=None, max_workers=MAX_WORKERS, api_base=API_BASE):
+    """Descarga años completos (país, año) en paralelo y devuelve (tarea, filas, incompletas) en orden.
+
+    `incompletas` son las tareas (país, año, mes, producto) cuyo acumulado no se pudo calcular
+    con la respuesta del año (ver `parse_slice`) y deben pedirse producto por producto.
+    """
+    def fetch_one(task):
+        country, year = task
+        url = api_base + api_slice_template % (country.replace('\'', '%27'), year)
+        response = fetch_json(session, url, limiter)
+        if response is None or not response.get('latest'):
+            return task, [], []
+        rows, incomplete = parse_slice(response)
+        return task, rows, [(country, year, month, product) for month, product in incomplete]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(fetch_one, tasks)
+
+
+def checkpoint_path(filepath):
+    """Ruta del manifiesto de progreso asociado a un archivo CSV."""
+    return filepath + '.checkpoint.json'
+
+
+def load_checkpoint(filepath):
+    """Lee del manifiesto las claves que la API ya respondió sin datos."""
+    path = checkpoint_path(filepath)
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        manifest = json.load(f)
+    return {tuple(key) for key in manifest.get('empty', [])}
+
+
+def save_checkpoint(filepath, empty):
+    """Guarda el manifiesto de forma atómica (archivo temporal + reemplazo)."""
+    path = checkpoint_path(filepath)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'updated': time.time(), 'empty': sorted(empty)}, f)
+    os.replace(tmp_path, path)
+
+
+def load_existing_keys(filepath):
+    """Devuelve el conjunto de claves (COUNTRY, YEAR, MONTH, PRODUCT) ya presentes en el CSV.
+
+    Si una ejecución anterior se interrumpió a mitad de una línea, esa línea
+    incompleta se descarta para que el archivo quede consistente.
+    """
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return set()
+
+    # Trunca una posible última línea a medio escribir
+    with open(filepath, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+        if not tail.endswith(b'\n'):
+            cut = tail.rfind(b'\n')
+            f.truncate(size - len(tail) + cut + 1 if cut >= 0 else 0)
+
+    keys = set()
+    with open(filepath, newline='') as f:
+        for row in csv.DictReader(f):
+            keys.add((row['COUNTRY'], int(row['YEAR']), int(row['MONTH']), row['PRODUCT']))
+    return keys
+
+
+def probe_published(years, products, countries, existing, session, limiter=None,
+                    max_workers=MAX_WORKERS, api_base=API_BASE, paises=paises_america):
+    """Detecta qué meses sin datos en el CSV ya fueron publicados por la API.
+
+    Para cada país y año se consulta un único producto de referencia mes a mes y se
+    detiene en el primer mes sin datos (la IEA publica los meses en orden). Devuelve el
+    conjunto de (país, año, mes) no publicados y las filas obtenidas durante el sondeo.
+    """
+    probe = PROBE_PRODUCT if PROBE_PRODUCT in products else products[0]
+    present = {key[:3] for key in existing}
+
+    # Meses pendientes de cada (país, año), en orden
+    pending = {}
+    for country in select_countries(countries, paises):
+        for year in years:
+            months = [m for m in range(1, 13) if (country, year, m) not in present]
+            if months:
+                pending[(country, year)] = months
+
+    unpublished, rows = set(), []
+    while pending:
+        # Cada ronda sondea en paralelo el siguiente mes pendiente de cada (país, año)
+        tasks = [(country, year, months[0], probe) for (country, year), months in pending.items()]
+        for (country, year, month, _), result in fetch_rows(tasks, session, limiter, max_workers, api_base):
+            months = pending.pop((country, year))
+            if result is None:
+                unpublished.update((country, year, m) for m in months)
+                continue
+            rows.append(result)
+            if months[1:]:
+                pending[(country, year)] = months[1:]
+    return unpublished, rows
+
+
+def run(filepath='DataSet.csv', max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+        api_base=API_BASE, paises=paises_america, resume=True, mode='product', database=None, verbose=None,
+        lists_ttl=LISTS_TTL):
+    """Descarga los datos de los países indicados que aún no están en el archivo CSV.
+
+    Con `resume` activo solo se consultan las claves que faltan en el CSV y los meses
+    recién publicados; el manifiesto guarda las combinaciones que la API respondió sin
+    datos para no volver a pedirlas. En modo 'year' se hace una sola solicitud por país
+    y año incompleto y las filas se reparten localmente. Con `database` las filas nuevas se
+    insertan o actualizan además en esa base SQLite. `verbose` (por defecto VERBOSE) imprime cada
+    fila nueva. Las listas de la API se reutilizan desde disco durante `lists_ttl` segundos.
+    Devuelve el número de filas escritas.
+    """
+    if mode not in FETCH_MODES:
+        raise ValueError('Modo de consulta desconocido: %s (opciones: %s)' % (mode, ', '.join(FETCH_MODES)))
+
+    session = create_session(max_workers)
+    limiter = RateLimiter(requests_per_second)
+
+    years, products, countries = fetch_lists(session, limiter, api_base, lists_cache_path(filepath), lists_ttl)
+
+    existing = load_existing_keys(filepath)
+    empty = load_checkpoint(filepath) if resume else set()
+
+    if mode == 'year':
+        # Un año se vuelve a pedir mientras le falte alguna clave que no esté en el CSV ni en el manifiesto,
+        # las mismas que se pedirían producto por producto
+        outstanding = {}
+        for task in build_tasks(years, products, countries, paises, existing, empty):
+            outstanding.setdefault(task[:2], []).append(task)
+
+        def results():
+            incomplete = []
+            for task, rows, pending in fetch_slices(list(outstanding), session, limiter, max_workers, api_base):
+                incomplete += [key for key in pending if key not in existing and key not in empty]
+                received = set(pending)
+                for row in rows:
+                    key = (row['COUNTRY'], int(row['YEAR']), int(row['MONTH']), row['PRODUCT'])
+                    received.add(key)
+                    yield key, row
+                # Claves de meses que la respuesta sí trae pero sin ese producto: publicadas sin datos, como en modo producto
+                published = {key[2] for key in received}
+                for key in outstanding[task]:
+                    if key[2] in published and key not in received:
+                        yield key, None
+            # Años a los que les faltan meses anteriores: esos productos se piden con el acumulado de la API
+            if incomplete:
+                logger.warning('⚠️ %d filas sin meses anteriores en la respuesta anual; se piden producto por producto',
+                               len(incomplete))
+            yield from fetch_rows(incomplete, session, limiter, max_workers, api_base)
+    else:
+        # Antes de pedir producto por producto, descarta los meses que la API aún no ha publicado
+        unpublished, probe_rows = set(), []
+        if resume:
+            unpublished, probe_rows = probe_published(years, products, countries, existing, session, limiter,
+                                                      max_workers, api_base, paises)
+
+        probed = {(row['COUNTRY'], int(row['YEAR']), int(row['MONTH']), row['PRODUCT']) for row in probe_rows}
+        tasks = [task for task in build_tasks(years, products, countries, paises, existing | probed, empty)
+                 if task[:3] not in unpublished]
+
+        def results():
+            for row in probe_rows:
+                yield (row['COUNTRY'], row['YEAR'], row['MONTH'], row['PRODUCT']), row
+            yield from fetch_rows(tasks, session, limiter, max_workers, api_base)
+
+    store = None
+    if database:
+        from DataStore import SQLiteStore
+        store = SQLiteStore(database)
+    pending = []
 
-    # Extrae los datos y los escribe en el archivo CSV
-    for year in years[index_last_year:]:
-        for month in range(index_last_month, 13):
-            for country in countries[index_last_country:]:
+    written = 0
+    write_header = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
 
-                # Guardamos una copia legible del nombre del país antes de codificarlo para la URL
-                country_name = country.strip().replace("'", "")
+    # Abre el archivo CSV para escritura (solo este hilo escribe, los hilos del pool solo descargan)
+    with open(filepath, 'a+', newline='') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=header)
+        if write_header:
+            writer.writeheader()
 
-                # Solo continuar si el país está en la lista de América
-                if country_name not in paises_america:
+        for i, (task, result) in enumerate(results(), start=1):
+            if result is None:
+                # El mes está publicado pero no hay datos de este producto: no se vuelve a pedir
+                empty.add(task)
+            else:
+                key = (result['COUNTRY'], int(result['YEAR']), int(result['MONTH']), result['PRODUCT'])
+                if key in existing:
                     continue
 
-                # Reemplaza apóstrofes en el nombre del país con %27 para crear una URL válida
-                country = country.replace('\'', '%27')
+                # Escribe el diccionario en el archivo CSV
+                writer.writerow(result)
+                pending.append(result)
+                existing.add(key)
+                written += 1
 
-                for product in products[index_last_product:]:
-                    # Envía una solicitud a la API para obtener datos mensuales del país, año, mes y producto actuales
-                    response = requests.get(
-                        api_information_template % (country, year, month, product)
-                    )
+                # Si el modo verbose está activado, imprime el resultado de este mes
+                if VERBOSE if verbose is None else verbose:
+                    pprint(result, sort_dicts=False)
+                    print('_________________________')
 
-                    # Verifica si la respuesta de la API fue exitosa
-                    if response.ok:
-                        # Analiza la respuesta en formato JSON
-                        response = response.json()
+            # Guarda el progreso periódicamente para poder reanudar tras una interrupción
+            if i % CHECKPOINT_EVERY == 0:
+                if resume:
+                    csv_file.flush()
+                    save_checkpoint(filepath, empty)
+                if store is not None and pending:
+                    store.upsert(pending)
+                    pending = []
 
-                        # Crea un diccionario con los datos que se escribirán en el archivo CSV
-                        result = dict()
+    if store is not None and pending:
+        store.upsert(pending)
 
-                        # Extrae los datos de la respuesta y los añade al diccionario, omitiendo 'CODE_TIME'
-                        for key, value in response['latest'][0].items():
-                            if key not in ['CODE_TIME', 'TIME', 'MONTH_NAME', 'DISPLAY_ORDER']:
-                                result[key] = value
- 
-                        # Añade datos acumulados del año actual y anterior, así como participación
-                        result['yearToDate'] = response['yearToDate']
+    if resume:
+        save_checkpoint(filepath, empty)
+    return written
 
-                        # Escribe el diccionario en el archivo CSV
-                        writer.writerow(result)
 
-                        # Si el modo verbose está activado, imprime el resultado de este mes
-                        if VERBOSE:
-                            pprint(result, sort_dicts=False)
-                            print('_________________________')
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Descarga datos mensuales de electricidad de la API de la IEA.')
+    parser.add_argument('--output', default='DataSet.csv', help='Archivo CSV de salida')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='Número de solicitudes simultáneas')
+    parser.add_argument('--rps', type=float, default=REQUESTS_PER_SECOND, help='Máximo de solicitudes por segundo (0 = sin límite)')
+    parser.add_argument('--api-base', default=API_BASE, help='URL base de la API')
+    parser.add_argument('--full', action='store_true', help='Ignora el manifiesto y vuelve a consultar todo lo que falta en el CSV')
+    parser.add_argument('--mode', choices=FETCH_MODES, default='product', help='Una solicitud por producto y mes, o una por país y año')
+    parser.add_argument('--sqlite', metavar='PATH', help='Inserta o actualiza también las filas nuevas en esta base SQLite')
+    parser.add_argument('--lists-ttl', type=float, default=LISTS_TTL, help='Segundos durante los que se reutilizan las listas de la API (0 = pedirlas siempre)')
+    args = parser.parse_args()
 
-                index_last_product = 0
-                index_last_month = 1
-                index_last_country = 0
+    run(args.output, max_workers=args.workers, requests_per_second=args.rps, api_base=args.api_base,
+        resume=not args.full, mode=args.mode, database=args.sqlite, lists_ttl=args.lists_ttl)
 
-# NOTA: Este código puede tardar un tiempo en ejecutarse debido al gran número de solicitudes a la API que se realizan.
+# NOTA: Aunque las solicitudes se hacen en paralelo, conviene mantener un límite de tasa razonable para no saturar la API.
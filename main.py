@@ -7,8 +7,8 @@ gráficos y análisis sobre producción, consumo, comercio y evolución de fuent
 
 Estructura:
 - Configuración de la interfaz y estilo
-- Carga y limpieza de datos
-- Segmentación y filtrado específico de datos
+- Carga y limpieza de datos (en caché por versión del archivo)
+- Selector de sección: cada sección extrae sus datos y construye su gráfico solo cuando se abre
 - Visualización de gráficos con explicaciones
 - Resultados y conclusiones
 - Fuentes de datos y mensaje final
@@ -19,8 +19,13 @@ Requiere:
 """
 
 # Importamos las bibliotecas necesarias
+import os
+import time
+import threading
+import pandas as pd
 import streamlit as st
-from CleanData import load_and_clean_data
+import Profiling
+from CleanData import STREAMING_MIN_BYTES, load_and_clean_data, load_annual_data, load_headline_metrics, source_key
 from SplitDataSet import SplitDataSet
 from GraphicsView import GraphicsView
 
@@ -55,196 +60,358 @@ st.markdown(
 
 st.markdown("---")
 
-# Carga y limpieza de datos desde archivo CSV con indicador de progreso para el usuario
-with st.spinner("Cargando datos..."):
-    filepath = 'DataSet.csv'  # Ruta del archivo con los datos
-    df = load_and_clean_data(filepath)  # Función importada para limpieza y carga
-
-# Segmentación y filtrado de datos para cada análisis específico
-energy_source_distribution_american = SplitDataSet.get_energy_source_distribution_american(df)
-renewable_trend = SplitDataSet.get_renewable_percentage(df)
-non_renewable_trend = SplitDataSet.get_non_renewable_percentage(df)
-colombia_trade = SplitDataSet.get_colombia_trade_data(df)
-colombia_export = SplitDataSet.get_colombia_energy_export_data(df)
-dist_sources_colombia = SplitDataSet.get_energy_source_distribution(df)
-dist_over_net_prod = SplitDataSet.get_distribution_over_net_production_colombia(df)
-renovables_vs_no = SplitDataSet.get_renewable_and_nonrenewable_data(df)
+# ================================
+# 🗄️ Caché de datos y gráficos
+# ================================
+# Motor de consultas: 'pandas' (índice en memoria) o 'sqlite' (consultas SQL sobre DataSet.sqlite)
+BACKEND = os.environ.get('ENERGIA_BACKEND', 'pandas')
+
+# Cada etapa se guarda en caché con la versión del archivo (fecha de modificación y tamaño) como parte de la clave:
+# si DataSet.csv cambia, la versión cambia y las entradas anteriores dejan de usarse. Cada sección extrae sus propios
+# datos y construye su gráfico solo cuando el usuario la abre.
+# Caben dos versiones: durante una actualización el hilo precalienta la nueva mientras las sesiones abiertas terminan
+# con la anterior, y con una sola entrada cada una expulsaría a la otra y se reconstruirían por turnos.
+VERSIONES_EN_CACHE = 2
+
+
+@st.cache_resource(show_spinner=False, max_entries=VERSIONES_EN_CACHE)
+def cargar_indice(filepath, version):
+    """Carga, limpia e indexa el dataset (sin diagnósticos en el dashboard).
+
+    Los archivos muy grandes se leen por bloques y se reducen al cubo anual, que es lo que usan los gráficos.
+    Con el motor 'sqlite' el CSV se sincroniza con la base y cada vista se resuelve con una consulta SQL.
+    """
+    if BACKEND == 'sqlite':
+        from DataStore import SQLiteStore, database_path
+        store = SQLiteStore(database_path(filepath))
+        store.sync_csv(filepath)
+        return store
+    if source_key(filepath)['size'] >= STREAMING_MIN_BYTES:
+        df = load_annual_data(filepath)
+    else:
+        df = load_and_clean_data(filepath, diagnostics='off')
+    return SplitDataSet.build_index(df)
+
+
+# Actualización en segundo plano: con ENERGIA_REFRESH_INTERVAL (segundos) un hilo descarga los datos nuevos, publica
+# el CSV de forma atómica y precalienta la caché de la versión nueva, así que nadie espera la descarga ni el recálculo
+REFRESH_INTERVAL = float(os.environ.get('ENERGIA_REFRESH_INTERVAL', 0))
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_actualizacion(filepath):
+    """Arranca una sola vez por proceso el hilo de actualización del dataset, o devuelve None si está desactivado."""
+    if REFRESH_INTERVAL <= 0:
+        return None
+    from Refresh import RefreshWorker
+
+    def precalentar(version):
+        cargar_indice(filepath, version)
+        cargar_metricas(filepath, version)
+
+    return RefreshWorker(filepath, REFRESH_INTERVAL, on_swap=precalentar).start()
+
+
+# Gráficos que no dependen de ningún control: (extracción de SplitDataSet, gráfico de GraphicsView)
+GRAFICOS = {
+    'renewable_trend': (SplitDataSet.get_renewable_percentage, GraphicsView.plot_renewable_trend),
+    'non_renewable_trend': (SplitDataSet.get_non_renewable_percentage, GraphicsView.plot_non_renewable_trend),
+    'colombia_trade': (SplitDataSet.get_colombia_trade_data, GraphicsView.plot_colombia_trade),
+    'colombia_export': (SplitDataSet.get_colombia_energy_export_data, GraphicsView.plot_colombia_energy_export),
+    'dist_sources_colombia': (SplitDataSet.get_energy_source_distribution, GraphicsView.plot_energy_source_distribution),
+    'dist_over_net_prod': (SplitDataSet.get_distribution_over_net_production_colombia, GraphicsView.plot_distribution_over_net_production_colombia),
+    'renovables_vs_no': (SplitDataSet.get_renewable_and_nonrenewable_data, GraphicsView.plot_renewable_and_nonrenewable_data),
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=len(GRAFICOS) * VERSIONES_EN_CACHE)
+def cargar_figura(filepath, version, nombre):
+    """Extrae los datos de un gráfico fijo y lo construye."""
+    extraer, graficar = GRAFICOS[nombre]
+    return graficar(extraer(cargar_indice(filepath, version)))
+
 
+@st.cache_data(show_spinner=False, max_entries=VERSIONES_EN_CACHE)
+def cargar_distribucion_americana(filepath, version):
+    """Distribución de fuentes de energía de todos los países, usada para las opciones del radar."""
+    return SplitDataSet.get_energy_source_distribution_american(cargar_indice(filepath, version))
+
+
+@st.cache_data(show_spinner=False, max_entries=VERSIONES_EN_CACHE)
+def cargar_metricas(filepath, version):
+    """Métricas de la sección de resultados por país y año.
+
+    Se guardan en disco junto al CSV con la misma clave que la caché del dataset, así que no se
+    recalculan al reiniciar el dashboard; si el CSV cambió, solo se recalculan los países y años con datos nuevos.
+    """
+    return load_headline_metrics(filepath, lambda: cargar_indice(filepath, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cargar_figura_radar(filepath, version, paises, anio):
+    """Gráfico radar para una combinación de países y año."""
+    return GraphicsView.plot_radar_energy_comparison(cargar_indice(filepath, version), selected_countries=list(paises), year=anio)
+
+
+def mostrar_grafico(filepath, version, nombre):
+    st.plotly_chart(cargar_figura(filepath, version, nombre))
+
+
+# ================================
+# 📑 Secciones del análisis
+# ================================
 # Visualizaciones y textos explicativos para cada sección del análisis energético
 
 # Sección 1: Radar - Comparación de fuentes de energía entre países (por año)
-st.header("1. Radar: Comparación de Fuentes de Energía entre Países (por Año)")
+def seccion_radar(filepath, version):
+    st.header("1. Radar: Comparación de Fuentes de Energía entre Países (por Año)")
 
-anios_disponibles = sorted(energy_source_distribution_american['ANIO'].unique(), reverse=True)
-anio_seleccionado = st.selectbox("Selecciona el año", anios_disponibles)
+    energy_source_distribution_american = cargar_distribucion_americana(filepath, version)
 
-df_anio = energy_source_distribution_american[energy_source_distribution_american['ANIO'] == anio_seleccionado]
+    anios_disponibles = sorted(energy_source_distribution_american['ANIO'].unique(), reverse=True)
+    anio_seleccionado = st.selectbox("Selecciona el año", anios_disponibles)
 
-paises_disponibles = sorted(df_anio['PAIS'].unique())
-# Lista de países que te gustaría ver por defecto
-default_countries = ["Argentina", "Brasil", "Canadá", "Chile", "Colombia",  "México",  "Estados Unidos",  "Costa Rica"]
+    df_anio = energy_source_distribution_american[energy_source_distribution_american['ANIO'] == anio_seleccionado]
 
-# Filtra los que realmente están disponibles en el año seleccionado
-default_valid = [pais for pais in default_countries if pais in paises_disponibles]
+    paises_disponibles = sorted(df_anio['PAIS'].unique())
+    # Lista de países que te gustaría ver por defecto
+    default_countries = ["Argentina", "Brasil", "Canadá", "Chile", "Colombia",  "México",  "Estados Unidos",  "Costa Rica"]
 
-# Ahora sí, usa el multiselect con valores válidos
-paises_seleccionados = st.multiselect(
-    "Selecciona los países a comparar",
-    options=paises_disponibles,
-    default=default_valid
-)
+    # Filtra los que realmente están disponibles en el año seleccionado
+    default_valid = [pais for pais in default_countries if pais in paises_disponibles]
 
-if len(paises_seleccionados) >= 2:
-    radar_fig = GraphicsView.plot_radar_energy_comparison(energy_source_distribution_american, selected_countries=paises_seleccionados, year=anio_seleccionado)
-    st.plotly_chart(radar_fig)
-else:
-    st.warning("Selecciona al menos dos países para comparar.")
+    # Ahora sí, usa el multiselect con valores válidos
+    paises_seleccionados = st.multiselect(
+        "Selecciona los países a comparar",
+        options=paises_disponibles,
+        default=default_valid
+    )
+
+    if len(paises_seleccionados) >= 2:
+        radar_fig = cargar_figura_radar(filepath, version, tuple(paises_seleccionados), int(anio_seleccionado))
+        st.plotly_chart(radar_fig)
+    else:
+        st.warning("Selecciona al menos dos países para comparar.")
+
+    st.markdown("""
+    Este gráfico de radar compara la distribución porcentual de diferentes fuentes de generación eléctrica
+    entre los países seleccionados para un año específico. Permite visualizar de forma clara y directa
+    las similitudes y diferencias en la matriz energética de cada nación, destacando la participación
+    de fuentes renovables y no renovables. Es una herramienta clave para entender la diversidad y el
+    grado de transición energética en la región americana.
+    """)
 
-st.markdown("""
-Este gráfico de radar compara la distribución porcentual de diferentes fuentes de generación eléctrica
-entre los países seleccionados para un año específico. Permite visualizar de forma clara y directa
-las similitudes y diferencias en la matriz energética de cada nación, destacando la participación
-de fuentes renovables y no renovables. Es una herramienta clave para entender la diversidad y el
-grado de transición energética en la región americana.
-""")
-st.markdown("---")
 
 # Sección 2: Energía Renovable en América
-st.subheader("2. Evolución de la Generación de Energía Renovable en América")
-st.plotly_chart(GraphicsView.plot_renewable_trend(renewable_trend))
-st.markdown("""
-Este gráfico muestra cómo ha evolucionado la participación de las fuentes de energía renovables en el mix de generación
-eléctrica de América desde 2020 hasta 2024. Incluye tecnologías como hidroeléctrica, solar, eólica y biomasa. Permite
-identificar tendencias de crecimiento sostenido, estancamiento o retroceso por país, evidenciando los compromisos reales
-con la transición energética y el cumplimiento de metas climáticas.
-""")
-st.markdown("---")
+def seccion_renovables(filepath, version):
+    st.subheader("2. Evolución de la Generación de Energía Renovable en América")
+    mostrar_grafico(filepath, version, 'renewable_trend')
+    st.markdown("""
+    Este gráfico muestra cómo ha evolucionado la participación de las fuentes de energía renovables en el mix de generación
+    eléctrica de América desde 2020 hasta 2024. Incluye tecnologías como hidroeléctrica, solar, eólica y biomasa. Permite
+    identificar tendencias de crecimiento sostenido, estancamiento o retroceso por país, evidenciando los compromisos reales
+    con la transición energética y el cumplimiento de metas climáticas.
+    """)
+
 
 # Sección 3: Energía No Renovable en América
-st.subheader("3. Evolución de la Generación de Energía No Renovable en América")
-st.plotly_chart(GraphicsView.plot_non_renewable_trend(non_renewable_trend))
-st.markdown("""
-Aquí se representa la trayectoria de la generación de energía eléctrica proveniente de fuentes no renovables,
-principalmente térmicas a base de carbón, gas natural y petróleo. La visualización permite analizar qué países están
-logrando disminuir su dependencia de combustibles fósiles y cuáles mantienen una matriz energética intensiva en carbono,
-lo cual tiene implicaciones tanto ambientales como económicas.
-""")
-st.markdown("---")
+def seccion_no_renovables(filepath, version):
+    st.subheader("3. Evolución de la Generación de Energía No Renovable en América")
+    mostrar_grafico(filepath, version, 'non_renewable_trend')
+    st.markdown("""
+    Aquí se representa la trayectoria de la generación de energía eléctrica proveniente de fuentes no renovables,
+    principalmente térmicas a base de carbón, gas natural y petróleo. La visualización permite analizar qué países están
+    logrando disminuir su dependencia de combustibles fósiles y cuáles mantienen una matriz energética intensiva en carbono,
+    lo cual tiene implicaciones tanto ambientales como económicas.
+    """)
+
 
 # Sección 4: Comercio Energético de Colombia
-st.subheader("4. Comercio de Electricidad en Colombia (2020-2024)")
-st.plotly_chart(GraphicsView.plot_colombia_trade(colombia_trade))
-st.markdown("""
-Esta visualización expone el comportamiento del comercio internacional de electricidad de Colombia, mostrando las
-cantidades exportadas e importadas año a año entre 2020 y 2024. Nos permite ver cómo ha evolucionado la balanza
-energética del país, en qué momentos ha necesitado importar energía y cuándo ha sido capaz de exportar, revelando su
-integración con los mercados regionales y la estabilidad de su sistema eléctrico.
-""")
-st.markdown("---")
+def seccion_comercio_colombia(filepath, version):
+    st.subheader("4. Comercio de Electricidad en Colombia (2020-2024)")
+    mostrar_grafico(filepath, version, 'colombia_trade')
+    st.markdown("""
+    Esta visualización expone el comportamiento del comercio internacional de electricidad de Colombia, mostrando las
+    cantidades exportadas e importadas año a año entre 2020 y 2024. Nos permite ver cómo ha evolucionado la balanza
+    energética del país, en qué momentos ha necesitado importar energía y cuándo ha sido capaz de exportar, revelando su
+    integración con los mercados regionales y la estabilidad de su sistema eléctrico.
+    """)
+
 
 # Sección 5: Producción vs Exportación en Colombia
-st.subheader("5. Comparación de Producción y Exportación de Electricidad en Colombia")
-st.plotly_chart(GraphicsView.plot_colombia_energy_export(colombia_export))
-st.markdown("""
-Este gráfico compara la producción nacional total de electricidad con las cantidades exportadas por Colombia en el mismo
-período. Permite evaluar la capacidad del país para generar excedentes energéticos sostenibles que soporten las
-exportaciones sin poner en riesgo el abastecimiento interno. También indica la eficiencia y confiabilidad de la
-infraestructura energética local.
-""")
-st.markdown("---")
+def seccion_produccion_exportacion(filepath, version):
+    st.subheader("5. Comparación de Producción y Exportación de Electricidad en Colombia")
+    mostrar_grafico(filepath, version, 'colombia_export')
+    st.markdown("""
+    Este gráfico compara la producción nacional total de electricidad con las cantidades exportadas por Colombia en el mismo
+    período. Permite evaluar la capacidad del país para generar excedentes energéticos sostenibles que soporten las
+    exportaciones sin poner en riesgo el abastecimiento interno. También indica la eficiencia y confiabilidad de la
+    infraestructura energética local.
+    """)
+
 
 # Sección 6: Distribución por Fuente en Colombia (2024)
-st.subheader("6. Distribución de Fuentes de Energía en Colombia (2024)")
-st.plotly_chart(GraphicsView.plot_energy_source_distribution(dist_sources_colombia))
-st.markdown("""
-Este gráfico muestra la proporción de cada tipo de fuente energética utilizada para generar electricidad en Colombia
-durante el año 2024. Distingue entre fuentes renovables (como hidroeléctrica, solar y eólica) y no renovables (térmicas
-de carbón, gas o petróleo). Esta información es clave para entender el nivel de sostenibilidad de la matriz energética
-del país y su vulnerabilidad ante eventos climáticos o precios internacionales del combustible.
-""")
-st.markdown("---")
+def seccion_fuentes_colombia(filepath, version):
+    st.subheader("6. Distribución de Fuentes de Energía en Colombia (2024)")
+    mostrar_grafico(filepath, version, 'dist_sources_colombia')
+    st.markdown("""
+    Este gráfico muestra la proporción de cada tipo de fuente energética utilizada para generar electricidad en Colombia
+    durante el año 2024. Distingue entre fuentes renovables (como hidroeléctrica, solar y eólica) y no renovables (térmicas
+    de carbón, gas o petróleo). Esta información es clave para entender el nivel de sostenibilidad de la matriz energética
+    del país y su vulnerabilidad ante eventos climáticos o precios internacionales del combustible.
+    """)
+
 
 # Sección 7: Distribución del Uso de la Producción Neta en Colombia
-st.subheader("7. Distribución del Uso de la Producción Neta en Colombia")
-st.plotly_chart(GraphicsView.plot_distribution_over_net_production_colombia(dist_over_net_prod))
-st.markdown("""
-En esta sección se detalla cómo se distribuyó la electricidad generada en Colombia durante el período analizado: qué
-porcentaje se destinó al consumo interno, cuánto se perdió en el sistema (pérdidas técnicas y no técnicas), y qué parte
-se dedicó al comercio internacional (exportaciones e importaciones). Este análisis permite evaluar la eficiencia del
-sistema eléctrico y detectar áreas de mejora en infraestructura o gestión.
-""")
-st.markdown("---")
+def seccion_uso_produccion_neta(filepath, version):
+    st.subheader("7. Distribución del Uso de la Producción Neta en Colombia")
+    mostrar_grafico(filepath, version, 'dist_over_net_prod')
+    st.markdown("""
+    En esta sección se detalla cómo se distribuyó la electricidad generada en Colombia durante el período analizado: qué
+    porcentaje se destinó al consumo interno, cuánto se perdió en el sistema (pérdidas técnicas y no técnicas), y qué parte
+    se dedicó al comercio internacional (exportaciones e importaciones). Este análisis permite evaluar la eficiencia del
+    sistema eléctrico y detectar áreas de mejora en infraestructura o gestión.
+    """)
+
 
 # Sección 8: Energía Renovable vs No Renovable en Colombia
-st.subheader("8. Evolución de Energía Renovable y No Renovable en Colombia")
-st.plotly_chart(GraphicsView.plot_renewable_and_nonrenewable_data(renovables_vs_no))
-st.markdown("""
-Esta visualización compara la evolución en el tiempo de la generación eléctrica a partir de fuentes renovables y no
-renovables en Colombia. Es fundamental para entender el ritmo y la dirección de la transición energética nacional,
-permitiendo identificar años clave de inflexión o retroceso, y evaluar si el país se está moviendo hacia una matriz más
-limpia y resiliente.
-""")
+def seccion_renovables_vs_no(filepath, version):
+    st.subheader("8. Evolución de Energía Renovable y No Renovable en Colombia")
+    mostrar_grafico(filepath, version, 'renovables_vs_no')
+    st.markdown("""
+    Esta visualización compara la evolución en el tiempo de la generación eléctrica a partir de fuentes renovables y no
+    renovables en Colombia. Es fundamental para entender el ritmo y la dirección de la transición energética nacional,
+    permitiendo identificar años clave de inflexión o retroceso, y evaluar si el país se está moviendo hacia una matriz más
+    limpia y resiliente.
+    """)
+
+
+# Resultados, conclusiones, proyección y fuente de los datos
+def resultados_relevantes(filepath, version):
+    # Resultados relevantes calculados con años cerrados (publicados hasta diciembre)
+    metricas = cargar_metricas(filepath, version)
+    cerrados = metricas[metricas['MES'] == 12]
+
+    st.subheader("📈 Resultados Relevantes")
+    # Sin ningún año cerrado (p. ej. un dataset con solo el año en curso) no hay nada que comparar
+    if cerrados.empty:
+        st.info("Aún no hay ningún año con datos hasta diciembre para calcular los resultados.")
+        return
+
+    # La comparación entre países usa el último año que cerró la mayoría de ellos, no el primero que publica diciembre
+    paises_por_anio = cerrados.groupby('ANIO')['PAIS'].nunique()
+    mayoria = paises_por_anio[paises_por_anio * 2 > metricas['PAIS'].nunique()]
+    anio = int(mayoria.index.max() if len(mayoria) else paises_por_anio.idxmax())
+    primer_anio = int(cerrados['ANIO'].min())
+    del_anio = cerrados[cerrados['ANIO'] == anio].sort_values('POSICION_CONSUMO')
+    lideres = ' y '.join(del_anio['PAIS'].iloc[:2])
+    menor = del_anio['PAIS'].iloc[-1]
+
+    renovables = cerrados[cerrados['ANIO'].isin([primer_anio, anio])].pivot(index='PAIS', columns='ANIO', values='CUOTA_RENOVABLES').dropna()
+    aumentos = int((renovables[anio] > renovables[primer_anio]).sum())
+
+    resultados = [
+        f"<li><strong>{lideres}</strong> lideran el consumo total de electricidad en América en {anio}.</li>",
+        f"<li><strong>{menor}</strong> presenta el menor consumo en comparación con el resto de países.</li>",
+        f"<li>La participación de las <strong>energías renovables</strong> aumentó entre {primer_anio} y {anio} en "
+        f"<strong>{aumentos} de {len(renovables)}</strong> países.</li>",
+    ]
+
+    # Los datos de Colombia usan su propio último año cerrado
+    colombia = cerrados[cerrados['PAIS'] == 'Colombia'].set_index('ANIO')
+    matriz = ''
+    if len(colombia):
+        anio_colombia = int(colombia.index.max())
+        crecimiento = colombia.loc[anio_colombia, 'CRECIMIENTO_EXPORTACIONES']
+        # Sin año anterior cerrado o sin exportaciones ese año el crecimiento es NaN y la frase se omite
+        if pd.notna(crecimiento):
+            tendencia = 'crecieron' if crecimiento >= 0 else 'cayeron'
+            resultados.append(f"<li>Las exportaciones de electricidad de <strong>Colombia</strong> {tendencia} un "
+                              f"<strong>{abs(crecimiento):.1f}%</strong> en {anio_colombia} respecto a {anio_colombia - 1}.</li>")
+        matriz = f"""
+    <h4 style='padding-top: 10px;'>Matriz energética de Colombia en {anio_colombia}:</h4>
+    <ul style='font-size: 1.05em;'>
+        <li><strong>{colombia.loc[anio_colombia, 'CUOTA_HIDROELECTRICA']:.1f}%</strong> proviene de <strong>hidroeléctrica</strong>.</li>
+        <li>La participación <strong>solar</strong> es aún baja, con un <strong>{colombia.loc[anio_colombia, 'CUOTA_SOLAR']:.2f}%</strong>.</li>
+        <li>Las fuentes <strong>fósiles</strong> como gas, carbón y petróleo aportan aún el <strong>{colombia.loc[anio_colombia, 'CUOTA_FOSILES']:.1f}%</strong>.</li>
+    </ul>
+    """
 
-st.markdown("---")
+    st.markdown(f"""
+    <ul style='font-size: 1.1em;'>
+        {"".join(resultados)}
+    </ul>
+    {matriz}""", unsafe_allow_html=True)
 
-# Resultados relevantes destacados en lista
-st.subheader("📈 Resultados Relevantes")
-st.markdown("""
-<ul style='font-size: 1.1em;'>
-    <li><strong>EE.UU. y Brasil</strong> lideran el consumo total de electricidad en América.</li>
-    <li><strong>Costa Rica</strong> presenta el menor consumo relativo en comparación con el resto de países.</li>
-    <li>Se observa un <strong>aumento sostenido de las energías renovables</strong> en gran parte de la región.</li>
-    <li><strong>Colombia</strong> ha mostrado un crecimiento en sus exportaciones de electricidad desde el año <strong>2023</strong>.</li>
-</ul>
-
-<h4 style='padding-top: 10px;'>Matriz energética de Colombia en 2024:</h4>
-<ul style='font-size: 1.05em;'>
-    <li><strong>54.3%</strong> proviene de <strong>hidroeléctrica</strong>.</li>
-    <li>La participación <strong>solar</strong> es aún baja, con un <strong>4.01%</strong>.</li>
-    <li>Persistente uso de fuentes <strong>fósiles</strong> como gas, carbón y petróleo.</li>
-</ul>
-""", unsafe_allow_html=True)
 
-st.markdown("---")
+def seccion_resultados(filepath, version):
+    resultados_relevantes(filepath, version)
 
-# Conclusiones generales extraídas del análisis
-st.subheader("📌 Conclusiones Generales")
-st.markdown("""
-1. **América muestra un panorama energético mixto.** Algunos países son autosuficientes en su generación eléctrica, mientras otros aún dependen de importaciones, lo que genera desigualdades en seguridad energética.
+    st.markdown("---")
 
-2. **La participación de fuentes renovables está creciendo**, especialmente gracias a la energía hidroeléctrica y solar. Sin embargo, este avance no es uniforme: algunos países han mantenido o incluso reducido su generación limpia.
+    # Conclusiones generales extraídas del análisis
+    st.subheader("📌 Conclusiones Generales")
+    st.markdown("""
+    1. **América muestra un panorama energético mixto.** Algunos países son autosuficientes en su generación eléctrica, mientras otros aún dependen de importaciones, lo que genera desigualdades en seguridad energética.
 
-3. **La dependencia de fuentes fósiles persiste en muchos países**, lo que representa un reto ambiental y económico frente a la volatilidad de precios y los compromisos climáticos globales.
+    2. **La participación de fuentes renovables está creciendo**, especialmente gracias a la energía hidroeléctrica y solar. Sin embargo, este avance no es uniforme: algunos países han mantenido o incluso reducido su generación limpia.
 
-4. **Colombia ha mantenido una matriz energética predominantemente renovable**, principalmente por su uso de energía hidroeléctrica, aunque sigue habiendo espacio para diversificar hacia otras fuentes limpias como la solar o eólica.
+    3. **La dependencia de fuentes fósiles persiste en muchos países**, lo que representa un reto ambiental y económico frente a la volatilidad de precios y los compromisos climáticos globales.
 
-5. **El comercio de electricidad en Colombia ha sido variable**, reflejando una interacción activa con sus vecinos, pero también cierta vulnerabilidad en momentos de baja generación o alta demanda.
+    4. **Colombia ha mantenido una matriz energética predominantemente renovable**, principalmente por su uso de energía hidroeléctrica, aunque sigue habiendo espacio para diversificar hacia otras fuentes limpias como la solar o eólica.
 
-6. **Las pérdidas en el sistema eléctrico colombiano siguen siendo un desafío.** Reducirlas podría significar un uso más eficiente de la energía generada.
-""")
+    5. **El comercio de electricidad en Colombia ha sido variable**, reflejando una interacción activa con sus vecinos, pero también cierta vulnerabilidad en momentos de baja generación o alta demanda.
 
-st.markdown("---")
+    6. **Las pérdidas en el sistema eléctrico colombiano siguen siendo un desafío.** Reducirlas podría significar un uso más eficiente de la energía generada.
+    """)
 
-# Proyección futura para el sector energético regional
-st.subheader("🔮 Proyección a Futuro")
-st.markdown("""
-- Se espera que la región avance hacia una **mayor adopción de fuentes renovables**, especialmente con inversiones en energía solar y eólica.
+    st.markdown("---")
+
+    # Proyección futura para el sector energético regional
+    st.subheader("🔮 Proyección a Futuro")
+    st.markdown("""
+    - Se espera que la región avance hacia una **mayor adopción de fuentes renovables**, especialmente con inversiones en energía solar y eólica.
 
-- **Colombia tiene el potencial de convertirse en un exportador regional más fuerte**, si fortalece su infraestructura, mejora su eficiencia y mantiene su matriz limpia.
+    - **Colombia tiene el potencial de convertirse en un exportador regional más fuerte**, si fortalece su infraestructura, mejora su eficiencia y mantiene su matriz limpia.
 
-- A medida que aumente la presión por cumplir los compromisos climáticos, los países con matrices energéticas aún intensivas en carbono deberán acelerar sus procesos de transición.
+    - A medida que aumente la presión por cumplir los compromisos climáticos, los países con matrices energéticas aún intensivas en carbono deberán acelerar sus procesos de transición.
 
-- La **digitalización, el almacenamiento energético y la cooperación entre países** serán claves para una red eléctrica más estable, eficiente y sostenible en América.
-""")
+    - La **digitalización, el almacenamiento energético y la cooperación entre países** serán claves para una red eléctrica más estable, eficiente y sostenible en América.
+    """)
+
+    st.markdown("---")
+
+    # Fuente oficial de los datos usados en el análisis
+    st.subheader("📚 Fuente de los Datos")
+    st.markdown("""
+    Los datos utilizados en esta aplicación provienen de la <a href='https://www.iea.org/' target='_blank'>Agencia Internacional de Energía (IEA)</a>, 
+    una fuente reconocida a nivel mundial por su análisis energético detallado y confiable. La información ha sido procesada y organizada para fines
+    de visualización y análisis comparativo entre países de América y el caso particular de Colombia durante el periodo 2020–2024.
+    """, unsafe_allow_html=True)
+
+# Secciones disponibles en el selector (solo se calcula la sección abierta)
+SECCIONES = {
+    "1. Radar de fuentes": seccion_radar,
+    "2. Renovable en América": seccion_renovables,
+    "3. No renovable en América": seccion_no_renovables,
+    "4. Comercio Colombia": seccion_comercio_colombia,
+    "5. Producción vs exportación": seccion_produccion_exportacion,
+    "6. Fuentes en Colombia": seccion_fuentes_colombia,
+    "7. Uso de la producción neta": seccion_uso_produccion_neta,
+    "8. Renovable vs no renovable": seccion_renovables_vs_no,
+    "📈 Resultados y conclusiones": seccion_resultados,
+}
+
+seccion = st.radio("Sección", list(SECCIONES), horizontal=True, label_visibility="collapsed")
 st.markdown("---")
 
-# Fuente oficial de los datos usados en el análisis
-st.subheader("📚 Fuente de los Datos")
-st.markdown("""
-Los datos utilizados en esta aplicación provienen de la <a href='https://www.iea.org/' target='_blank'>Agencia Internacional de Energía (IEA)</a>, 
-una fuente reconocida a nivel mundial por su análisis energético detallado y confiable. La información ha sido procesada y organizada para fines
-de visualización y análisis comparativo entre países de América y el caso particular de Colombia durante el periodo 2020–2024.
-""", unsafe_allow_html=True)
+# Carga de la sección seleccionada con indicador de progreso para el usuario
+inicio_perfil = Profiling.mark()
+with st.spinner("Cargando datos..."), Profiling.timed('main.seccion[%s]' % seccion):
+    filepath = 'DataSet.csv'  # Ruta del archivo con los datos
+    actualizacion = iniciar_actualizacion(filepath)
+    version = tuple(source_key(filepath).values())  # Versión del archivo: invalida la caché cuando cambia
+    SECCIONES[seccion](filepath, version)
 
 st.markdown("---")
 
@@ -269,3 +436,28 @@ st.markdown("""
     </em></strong>
 </div>
 """, unsafe_allow_html=True)
+
+# Estado de la última actualización en segundo plano, si está activada
+if actualizacion is not None and actualizacion.status['fin'] is not None:
+    estado = actualizacion.status
+    with st.sidebar:
+        if estado['error']:
+            st.caption("⚠️ La última actualización de datos falló; se muestran los datos anteriores.")
+        else:
+            st.caption("🔄 Última actualización de datos: %s (%d filas nuevas)" % (
+                time.strftime('%Y-%m-%d %H:%M', time.localtime(estado['fin'])), estado['filas']))
+
+# ================================
+# 🩺 Panel de tiempos (solo con ENERGIA_PROFILING=1)
+# ================================
+# Etapas medidas en esta ejecución del script; las que se sirvieron desde la caché de Streamlit no aparecen
+if Profiling.is_enabled():
+    registros = Profiling.records(since=inicio_perfil, thread=threading.get_ident())
+    with st.sidebar:
+        st.subheader("⏱️ Tiempos de esta ejecución")
+        st.dataframe(
+            [{clave: registro[clave] for clave in ('etapa', 'ms', 'filas_entrada', 'filas_salida', 'memoria_kb')} for registro in registros],
+            hide_index=True
+        )
+        st.download_button("Descargar JSON lines", Profiling.to_jsonl(registros), file_name="perfil.jsonl")
+        st.download_button("Descargar métricas Prometheus", Profiling.to_prometheus(), file_name="metrics.prom")